@@ -0,0 +1,125 @@
+"""
+Compares the two DMOJ page parsers in `daisy_cli.platforms.dmoj`:
+  - parse_problem_html, building a full BeautifulSoup tree
+  - parse_problem_stream, feeding an lxml target parser that keeps only
+    the text the extractor reads
+
+Builds a synthetic problem page wrapped in heavy site chrome (navigation,
+sidebar, a long comment thread), checks both parsers agree on it, then
+reports the best parse time and the peak RSS each parser adds on top of a
+fresh interpreter.
+
+    python benchmarks/dmoj_parsing.py [--comments 3000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from daisy_cli.platforms.dmoj import parse_problem_html, parse_problem_stream
+
+PARSERS = {
+    "tree (bs4)": "parse_problem_html",
+    "stream (lxml target)": "parse_problem_stream",
+}
+
+PROBLEM = """
+<div class="problem-title"><h2>Benchmark '25 P1 - Long Statement</h2></div>
+<div class="content-description screen">
+{description}
+<h4>Constraints</h4>
+<p>~1 \\le N \\le 10^5~</p>
+<h4>Input Specification</h4>
+<p>The first line contains ~N~.</p>
+<h4>Output Specification</h4>
+<p>Output the answer.</p>
+<h4>Sample Input 1</h4>
+<pre><code>3
+1 2 3</code></pre>
+<h4>Sample Output 1</h4>
+<pre><code>6</code></pre>
+</div>
+"""
+COMMENT = """
+<li class="comment"><div class="comment-display"><div class="info">
+<a href="/user/u{i}" class="user">u{i}</a><span class="time">{i} days ago</span>
+<a href="#" class="vote-up" title="Upvote"><i class="fa fa-chevron-up"></i></a>
+</div><div class="content content-description"><p>Hint {i}: try sorting ~a_{i}~ first.</p></div></div></li>
+"""
+
+def build_page(comments: int) -> str:
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(200))
+    sidebar = "".join(f'<div class="pi"><span>Limit {i}</span><span>{i} MB</span></div>' for i in range(200))
+    description = "".join(f"<p>Paragraph {i} with ~x_{i} \\le 10^9~ math.</p>" for i in range(50))
+    thread = "".join(COMMENT.format(i=i) for i in range(comments))
+    return (
+        "<!DOCTYPE html><html><head><title>DMOJ</title>"
+        "<style>body { margin: 0 }</style><script>var config = {};</script></head><body>"
+        f'<nav><ul id="nav-list">{nav}</ul></nav><main id="content">'
+        f'<div id="content-right">{sidebar}</div>'
+        f"{PROBLEM.format(description=description)}"
+        f'<div id="comments"><ul class="comments top-level-comments">{thread}</ul></div>'
+        "</main></body></html>"
+    )
+
+def measure_rss(parser: str, page: Path) -> float:
+    """Peak RSS (MB) that `parser` adds to a fresh interpreter with the page loaded."""
+    # a child starts with its parent's ru_maxrss, so on Linux reset the
+    # high-water mark through clear_refs and read VmHWM instead
+    code = f"""
+import json, resource
+from daisy_cli.platforms import dmoj
+from lxml import etree
+
+def peak_kib():
+    try:
+        with open("/proc/self/status") as f:
+            return int(next(line for line in f if line.startswith("VmHWM")).split()[1])
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+html = open({str(page)!r}, encoding="utf-8").read()
+try:
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+except OSError:
+    pass
+before = peak_kib()
+dmoj.{parser}(html)
+print(json.dumps(peak_kib() - before))
+"""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout) / 1024
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--comments", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = build_page(args.comments)
+    if parse_problem_html(html) != parse_problem_stream(html):
+        print("error: parse_problem_stream output differs from parse_problem_html")
+        return 1
+
+    print(f"page: {len(html) / 1024:.0f} KiB, {args.comments} comments")
+    with tempfile.TemporaryDirectory() as tmp:
+        page = Path(tmp) / "page.html"
+        page.write_text(html, encoding="utf-8")
+        for name, func in PARSERS.items():
+            parse = globals()[func]
+            elapsed = min(timeit.repeat(lambda: parse(html), number=1, repeat=args.repeat))
+            rss = measure_rss(func, page)
+            print(f"{name:<22} {elapsed * 1000:9.2f} ms  {rss:8.1f} MB peak RSS")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Benchmark for the LeetCode example-value parser in `daisy_cli.platforms.leetcode`.
+
+Builds synthetic example inputs far larger than typical statements, then
+times `_parse_assignments` (input line to Rust `let` values) and
+`_to_rust_value` (output line) on each:
+  - flat: one array of --size integers
+  - matrix: a square matrix of about --size integers
+  - strings: an array of --size / 10 quoted strings, with commas inside
+  - tree: a level-order tree array with nulls
+  - nested: lists nested --depth levels deep
+
+    python benchmarks/sample_values.py [--size 100000] [--depth 2000] [--repeat 5]
+"""
+import argparse
+import math
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from daisy_cli.platforms.leetcode import _parse_assignments, _to_rust_value
+
+def build_inputs(size: int, depth: int) -> dict[str, tuple[str, str, int]]:
+    """{case: (input line, output line, number of assignments)}"""
+    rng = random.Random(size)
+    side = math.isqrt(size)
+    matrix = ",".join(
+        "[" + ",".join(str(rng.randint(-10**9, 10**9)) for _ in range(side)) + "]"
+        for _ in range(side)
+    )
+    words = ",".join(f'"w{rng.randint(0, 10**6)},{i}"' for i in range(size // 10))
+    tree = ",".join("null" if rng.random() < 0.3 else str(rng.randint(0, 10**5)) for _ in range(size))
+    flat = ",".join(str(rng.randint(-10**9, 10**9)) for _ in range(size))
+    nested = "[" * depth + "1" + "]" * depth
+    return {
+        "flat": (f"nums = [{flat}], k = 3", f"[{flat}]", 2),
+        "matrix": (f"grid = [{matrix}], target = 7", f"[{matrix}]", 2),
+        "strings": (f"words = [{words}], sep = ','", f"[{words}]", 2),
+        "tree": (f"root = [{tree}]", f"[{tree}]", 1),
+        "nested": (f"deep = {nested}", nested, 1),
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--depth", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, (text, output, assignments) in build_inputs(args.size, args.depth).items():
+        if len(_parse_assignments(text)) != assignments or _to_rust_value(output) == output:
+            print(f"error: {name} input didn't parse completely")
+            return 1
+
+        best_input = min(timeit.repeat(lambda: _parse_assignments(text), number=1, repeat=args.repeat))
+        best_output = min(timeit.repeat(lambda: _to_rust_value(output), number=1, repeat=args.repeat))
+        mib_per_s = len(text) / best_input / 2**20
+        print(
+            f"{name:<8} {len(text) / 1024:9.1f} KiB  input {best_input * 1000:9.2f} ms"
+            f"  output {best_output * 1000:9.2f} ms  ({mib_per_s:.1f} MiB/s)"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Offline benchmark suite for the scraping pipeline.
+
+Runs every stage of `daisy pull` after the network request on the recorded
+payloads in benchmarks/fixtures/ (small, typical and pathological problems
+per platform), timing each stage on its own:
+  - parse: decode the payload and build the BeautifulSoup tree
+  - format: statement text formatting (`daisy_cli.utils`)
+  - samples: sample extraction (for DMOJ, the section pass that finds them)
+  - extract: the platform's whole parse step, as `pull` runs it; dmoj_api
+    covers /api/v2/problem responses carrying the markdown statement source
+  - index: building the Codeforces problem index from a problemset.problems
+    response (fixtures/codeforces/problemset.json)
+  - render: template rendering (`daisy_cli.formatter`)
+  - write: writing the project files of a new project (`daisy_cli.writer`)
+  - rewrite: writing them again over unchanged files, as a re-pull does
+
+Results are printed and, with --json, saved so runs can be compared over
+time with --compare.
+
+    python benchmarks/scraping.py [--platform dmoj] [--fixture typical]
+        [--json results.json] [--compare baseline.json]
+"""
+import argparse
+import datetime
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+from bs4 import BeautifulSoup
+
+from daisy_cli.formatter import render_rust_template
+from daisy_cli.platforms import codeforces, dmoj
+from daisy_cli.platforms.leetcode import extract_sample, parse_question
+from daisy_cli.utils import (
+    clean_title,
+    extract_clean_title,
+    format_codeforces_text,
+    format_dmoj_text,
+    format_leetcode_node,
+    to_snake_case,
+)
+from daisy_cli.writer import write_rust_project
+
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+FIXTURES = ("small", "typical", "pathological")
+MIN_TIME = 0.2  # seconds per timing run, like `python -m timeit`
+
+def write_stages(name: str, files: dict[str, str], out_dir: Path) -> dict[str, Callable]:
+    runs = itertools.count()
+    return {
+        "write": lambda: write_rust_project(name, files, out_dir / f"run{next(runs)}"),
+        "rewrite": lambda: write_rust_project(name, files, out_dir),
+    }
+
+def leetcode_stages(payload: str, out_dir: Path) -> dict[str, Callable]:
+    question = json.loads(payload)["data"]["question"]
+    soup = BeautifulSoup(question["content"], "lxml")
+    nodes = soup.find_all(["p", "li"])
+    pres = soup.find_all("pre")
+    data = parse_question(question)
+    files = render_rust_template(data, "leetcode")
+    name = to_snake_case(data["title"])
+
+    return {
+        "parse": lambda: BeautifulSoup(json.loads(payload)["data"]["question"]["content"], "lxml"),
+        "format": lambda: [format_leetcode_node(node) for node in nodes],
+        "samples": lambda: [extract_sample(pre) for pre in pres],
+        "extract": lambda: parse_question(question),
+        "render": lambda: render_rust_template(data, "leetcode"),
+        **write_stages(name, files, out_dir),
+    }
+
+def dmoj_stages(html: str, out_dir: Path) -> dict[str, Callable]:
+    soup = BeautifulSoup(html, "lxml")
+    title = extract_clean_title(soup)
+    texts = [p.text.strip() for p in soup.find_all("p")]
+    elements = [(tag.name, id(tag.parent), tag.text.strip(), tag) for tag in soup.find_all(dmoj.SECTION_TAGS)]
+    data = dmoj.parse_problem_html(html)
+    files = render_rust_template(data, "dmoj")
+    name = to_snake_case(data["title"])
+
+    return {
+        "parse": lambda: BeautifulSoup(html, "lxml"),
+        "format": lambda: [format_dmoj_text(text) for text in texts],
+        "samples": lambda: dmoj._sort_sections(title, elements),
+        "extract": lambda: dmoj.parse_problem_html(html),
+        "extract (stream)": lambda: dmoj.parse_problem_stream(html),
+        "render": lambda: render_rust_template(data, "dmoj"),
+        **write_stages(name, files, out_dir),
+    }
+
+def dmoj_api_stages(payload: str, out_dir: Path) -> dict[str, Callable]:
+    problem = dmoj._api_problem(payload)
+    title = clean_title(problem["name"])
+    source = problem["description"]
+    elements = dmoj._markdown_elements(source)
+    texts = [text for name, _, text, _ in elements if name == "p"]
+    data = dmoj.parse_problem_source(source, title)
+    files = render_rust_template(data, "dmoj")
+    name = to_snake_case(data["title"])
+
+    return {
+        "parse": lambda: dmoj._markdown_elements(dmoj._api_problem(payload)["description"]),
+        "format": lambda: [format_dmoj_text(text) for text in texts],
+        "samples": lambda: dmoj._sort_sections(title, elements),
+        "extract": lambda: dmoj.parse_problem_source(dmoj._api_problem(payload)["description"], title),
+        "render": lambda: render_rust_template(data, "dmoj"),
+        **write_stages(name, files, out_dir),
+    }
+
+def codeforces_stages(html: str, out_dir: Path) -> dict[str, Callable]:
+    soup = BeautifulSoup(html, "lxml")
+    texts = [p.get_text() for p in soup.select("div.problem-statement p")]
+    pres = soup.select("div.sample-test pre")
+    problemset = (FIXTURES_DIR / "codeforces" / "problemset.json").read_text(encoding="utf-8")
+    data = codeforces.parse_problem_html(html)
+    files = render_rust_template(data, "codeforces")
+    name = to_snake_case(data["title"])
+
+    return {
+        "parse": lambda: BeautifulSoup(html, "lxml"),
+        "format": lambda: [format_codeforces_text(text) for text in texts],
+        "samples": lambda: [codeforces._pre_text(pre) for pre in pres],
+        "extract": lambda: codeforces.parse_problem_html(html),
+        "index": lambda: codeforces._index_problems(codeforces._api_result(problemset)["problems"]),
+        "render": lambda: render_rust_template(data, "codeforces"),
+        **write_stages(name, files, out_dir),
+    }
+
+PLATFORMS = {
+    "leetcode": ("json", leetcode_stages),
+    "dmoj": ("html", dmoj_stages),
+    "dmoj_api": ("json", dmoj_api_stages),
+    "codeforces": ("html", codeforces_stages),
+}
+
+def time_stage(func: Callable, repeat: int) -> dict:
+    """Best and median time per call in ms, auto-scaling the loop count like timeit."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * MIN_TIME / 0.2))
+    runs = [t / number * 1000 for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best_ms": min(runs), "median_ms": statistics.median(runs), "loops": number}
+
+def git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def load_baseline(path: Path) -> dict[tuple[str, str, str], float]:
+    report = json.loads(path.read_text(encoding="utf-8"))
+    return {(r["platform"], r["fixture"], r["stage"]): r["best_ms"] for r in report["results"]}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--platform", choices=PLATFORMS, action="append", help="only this platform (repeatable)")
+    parser.add_argument("--fixture", choices=FIXTURES, action="append", help="only this fixture size (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="save the results to this file")
+    parser.add_argument("--compare", type=Path, help="show the change against an earlier --json file")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    results = []
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name in args.platform or PLATFORMS:
+            extension, build_stages = PLATFORMS[name]
+            for fixture in args.fixture or FIXTURES:
+                path = FIXTURES_DIR / name / f"{fixture}.{extension}"
+                payload = path.read_text(encoding="utf-8")
+                print(f"{name}/{fixture} ({len(payload) / 1024:.1f} KiB)")
+
+                for stage, func in build_stages(payload, Path(out_dir)).items():
+                    timing = time_stage(func, args.repeat)
+                    results.append({"platform": name, "fixture": fixture, "stage": stage, **timing})
+
+                    line = f"  {stage:<18} {timing['best_ms']:10.3f} ms  (median {timing['median_ms']:.3f})"
+                    before = baseline.get((name, fixture, stage))
+                    if before:
+                        line += f"  {timing['best_ms'] / before:6.2f}x vs baseline"
+                    print(line)
+
+    if args.json:
+        report = {
+            "meta": {
+                "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"results saved to {args.json}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
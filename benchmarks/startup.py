@@ -0,0 +1,78 @@
+"""
+Startup budget check for the `daisy` entry point.
+
+Imports `daisy_cli.cli` in fresh interpreters under `python -X importtime`
+and fails when the best cumulative import time goes over the budget, or
+when a scraping-only dependency is loaded at startup.
+
+    python benchmarks/startup.py [--budget-ms 150] [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+ENTRY_MODULE = "daisy_cli.cli"
+BUDGET_MS = 150.0
+# only `daisy pull` needs these, so `daisy check`/`daisy --help` must not pay for them
+FORBIDDEN_MODULES = ("requests", "urllib3", "bs4", "lxml", "jinja2", "asyncio", "multiprocessing")
+
+def measure_once() -> tuple[float, set[str]]:
+    """Return (cumulative import time of ENTRY_MODULE in ms, modules it imported)."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_MODULE}"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+
+    total_us = None
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        modules.add(name.strip())
+        if name.strip() == ENTRY_MODULE:
+            total_us = int(cumulative)
+
+    if total_us is None:
+        raise RuntimeError(f"{ENTRY_MODULE} missing from -X importtime output")
+    return total_us / 1000, modules
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = []
+    imported = set()
+    for _ in range(args.runs):
+        elapsed_ms, modules = measure_once()
+        timings.append(elapsed_ms)
+        imported |= modules
+
+    best = min(timings)
+    print(f"import {ENTRY_MODULE}: best {best:.1f} ms, worst {max(timings):.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    leaked = sorted(m for m in imported if m.split(".")[0] in FORBIDDEN_MODULES)
+    if leaked:
+        print(f"error: scraping dependencies imported at startup: {', '.join(leaked)}")
+        failed = True
+    if best > args.budget_ms:
+        print(f"error: startup import time over budget by {best - args.budget_ms:.1f} ms")
+        failed = True
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Micro-benchmark for the statement text formatters in `daisy_cli.utils`.
+
+Builds a large synthetic LeetCode statement (many <p>/<li> fragments full of
+<code> and <sup>) and DMOJ statement (many ~math~ blocks), then times:
+  - format_leetcode_text(str(node)), the serialize-and-reparse path
+  - format_leetcode_node(node), formatting the already-parsed nodes
+  - format_dmoj_text on the whole DMOJ statement
+
+    python benchmarks/text_formatting.py [--fragments 2000] [--repeat 5]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bs4 import BeautifulSoup
+
+from daisy_cli.utils import format_dmoj_text, format_leetcode_node, format_leetcode_text
+
+LEETCODE_FRAGMENTS = (
+    "<p>Given an array <code>nums</code> of length <code>n</code>, return the number of "
+    "pairs <code>(i, j)</code> such that <code>nums[i] + nums[j] &lt;= target</code>.</p>",
+    "<li><code>1 &lt;= nums.length &lt;= 10<sup>5</sup></code></li>",
+    "<li><code>-10<sup>9</sup> &lt;= nums[i], target &lt;= 10<sup>9</sup></code></li>",
+    "<p>Can you solve it in <code>O(n log n)</code> time and <code>O(1)</code> extra space?</p>",
+)
+DMOJ_LINES = (
+    "Given ~N~ integers ~a_1, a_2, \\dots, a_N~ where ~1 \\le N \\le 10^5~, find the answer.",
+    "Each query has ~0 \\le l \\le r < N~ and ~x \\ne y~, for a total of ~Q \\times N~ work.",
+)
+
+def build_inputs(fragments: int) -> tuple[list, str]:
+    html = "".join(LEETCODE_FRAGMENTS[i % len(LEETCODE_FRAGMENTS)] for i in range(fragments))
+    nodes = BeautifulSoup(f"<ul>{html}</ul>", "lxml").find_all(["p", "li"])
+    dmoj_text = "\n".join(DMOJ_LINES[i % len(DMOJ_LINES)] for i in range(fragments))
+    return nodes, dmoj_text
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fragments", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    nodes, dmoj_text = build_inputs(args.fragments)
+    cases = {
+        "leetcode reparse (str(node))": lambda: [format_leetcode_text(str(node)) for node in nodes],
+        "leetcode node": lambda: [format_leetcode_node(node) for node in nodes],
+        "dmoj": lambda: format_dmoj_text(dmoj_text),
+    }
+
+    # the two leetcode paths must agree before their timings mean anything
+    reparsed, direct, _ = (case() for case in cases.values())
+    if reparsed != direct:
+        print("error: format_leetcode_node output differs from format_leetcode_text")
+        return 1
+
+    timings = {}
+    for name, case in cases.items():
+        timings[name] = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:<30} {timings[name] * 1000:9.2f} ms  ({args.fragments} fragments)")
+
+    speedup = timings["leetcode reparse (str(node))"] / timings["leetcode node"]
+    print(f"node-based leetcode formatting is {speedup:.1f}x faster than reparsing")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
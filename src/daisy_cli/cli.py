@@ -1,38 +1,150 @@
+import hashlib
+import importlib
+import io
 import json
+import os
 import re
+import sqlite3
 import subprocess
 import sys
-from collections.abc import Callable
+import threading
+import time
+from collections.abc import Callable, Collection, Iterator
+from datetime import datetime
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
+from typing import TextIO
 from urllib.parse import urlparse
 
 import rich_click as click
 from rich.console import Console
 
-from daisy_cli.formatter import render_rust_template
-from daisy_cli.platforms import dmoj, leetcode
-from daisy_cli.utils import to_snake_case
-from daisy_cli.writer import write_rust_project
+from daisy_cli import profiling
+from daisy_cli.platforms import client
+from daisy_cli.platforms.cache import DEFAULT_TTL, ResponseCache
+from daisy_cli.discovery import discover_projects, filter_projects
+from daisy_cli.processes import CommandResult, kill_running_commands, run_command
+from daisy_cli.profiling import span
+from daisy_cli.progress import CheckRecord, ProgressStore, test_fields
+from daisy_cli.workspace import add_workspace_member, member_path, package_name, read_members, sync_workspace
+from daisy_cli.writer import CREATED, KEPT, KEPT_NO_MANIFEST, UNCHANGED, write_rust_project
 
+# scrapers are "module:function" paths so their heavy dependencies
+# (requests, bs4, lxml, jinja2) are only imported by commands that scrape
 SCRAPERS = {
-    "dmoj.ca": dmoj.extract_problem_parts,
-    "leetcode.com": leetcode.extract_problem_parts,
+    "codeforces.com": "daisy_cli.platforms.codeforces:extract_problem_parts",
+    "dmoj.ca": "daisy_cli.platforms.dmoj:extract_problem_parts",
+    "leetcode.com": "daisy_cli.platforms.leetcode:extract_problem_parts",
+}
+ASYNC_SCRAPERS = {
+    "codeforces.com": "daisy_cli.platforms.codeforces:extract_problem_parts_async",
+    "dmoj.ca": "daisy_cli.platforms.dmoj:extract_problem_parts_async",
+    "leetcode.com": "daisy_cli.platforms.leetcode:extract_problem_parts_async",
+}
+# scrapers that can fetch many problems from the same site in fewer requests
+BATCH_SCRAPERS = {
+    "leetcode.com": "daisy_cli.platforms.leetcode:extract_many_problem_parts",
 }
 EXERCISES_DIR = Path("exercises")
-PROGRESS_FILE = EXERCISES_DIR / ".daisy_progress.json"
+PROGRESS_DB = EXERCISES_DIR / ".daisy_progress.sqlite3"
+# JSON file written by earlier versions, imported into a new progress database
+LEGACY_PROGRESS_FILE = EXERCISES_DIR / ".daisy_progress.json"
+
+# crate inputs that can change the outcome of `cargo test`
+FINGERPRINT_FILES = ("Cargo.toml", "Cargo.lock", "build.rs")
+FINGERPRINT_DIRS = ("src", "tests", "examples", "benches")
+
+# cargo prints one "Running <binary>" line per test binary it starts, and
+# "could not compile" when the crate's own code doesn't build
+CARGO_RUNNING_PATTERN = re.compile(r"^\s+Running ", re.MULTILINE)
+CARGO_COMPILE_ERROR = "could not compile"
+
+# libtest prints one "test <name> ... <status>" line per executed test,
+# "running <n> tests" before a binary's tests and "test result: ..." after them
+TEST_RESULT_PATTERN = re.compile(r"^test (?P<name>.+?) \.\.\. (?P<status>ok|FAILED|ignored)\b")
+TEST_RUNNING_PATTERN = re.compile(r"^running (?P<count>\d+) tests?$")
+TEST_SUMMARY_PATTERN = re.compile(r"^test result: ")
+# tests known to be running: with one test thread, the name is printed before
+# the test runs; otherwise libtest warns about the ones past 60 seconds
+TEST_STARTED_PATTERN = re.compile(r"^test (?P<name>.+?) \.\.\.$")
+TEST_SLOW_PATTERN = re.compile(r"^test (?P<name>.+) has been running for over \d+ seconds$")
+# matches the threshold of that libtest warning
+DEFAULT_TEST_TIMEOUT = 60.0
 
 console = Console()
 
 
+class TestWatch:
+    """
+    Follows libtest output for `run_command`, bounding how long a test binary
+    may go without a test finishing. Tests only start when another one
+    finishes, so once `test_timeout` seconds pass since the binary started
+    or last reported, whatever is still running has taken at least that long.
+    """
+    
+    def __init__(self, test_timeout: float | None):
+        self.test_timeout = test_timeout
+        self.pending = 0
+        self.last_progress = 0.0
+    
+    def __call__(self, at: float, line: str) -> float | None:
+        line = line.strip()
+        running = TEST_RUNNING_PATTERN.match(line)
+        if running:
+            self.pending = int(running.group("count"))
+            self.last_progress = at
+        elif TEST_SUMMARY_PATTERN.match(line):
+            self.pending = 0
+        elif self.pending and TEST_RESULT_PATTERN.match(line):
+            self.pending -= 1
+            self.last_progress = at
+        
+        if not self.test_timeout or not self.pending:
+            return None
+        return self.last_progress + self.test_timeout
+
+
 class TestRunner:
     """Handles running and parsing cargo tests."""
     
-    def __init__(self, project_dir: Path, verbose: bool = False):
+    def __init__(
+        self,
+        project_dir: Path,
+        verbose: bool = False,
+        individual: bool = False,
+        output: Console | None = None,
+        target_dir: Path | None = None,
+        timeout: float | None = None,
+        test_timeout: float | None = None,
+    ):
         self.project_dir = project_dir
         self.verbose = verbose
+        self.individual = individual
+        self.output = output or console
+        self.target_dir = target_dir
+        self.timeout = timeout
+        self.test_timeout = test_timeout
+        self.timed_out = False
+        # cargo failed before building the crate's code, e.g. on the registry
+        self.infra_failed = False
+        self._deadline: float | None = None
     
-    def run_tests(self) -> tuple[bool, list[tuple[str, bool]]]:
-        """Run cargo tests and return (success, test_results)."""
+    def run_tests(self) -> tuple[bool, list[tuple]]:
+        """
+        Run cargo tests and return (success, test_results). Past `timeout`
+        seconds for the whole crate, or `test_timeout` for one test, the cargo
+        and test processes are killed and `timed_out` is set. A failure
+        outside the crate's code, such as an unreachable registry, sets
+        `infra_failed`.
+        """
+        self.timed_out = False
+        self.infra_failed = False
+        self._deadline = time.monotonic() + self.timeout if self.timeout else None
+        
+        if not self.individual:
+            return self._run_single_pass()
+        
         test_names = self._enumerate_tests()
         
         if not test_names:
@@ -40,19 +152,104 @@ class TestRunner:
         
         return self._run_individual_tests(test_names)
     
-    def _run_command(self, cmd: list[str]) -> subprocess.CompletedProcess:
+    def _run_command(self, cmd: list[str]) -> CommandResult:
         """Run subprocess command with consistent settings."""
-        return subprocess.run(
-            cmd,
-            cwd=self.project_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True
-        )
+        env = None
+        if self.target_dir is not None:
+            env = {**os.environ, "CARGO_TARGET_DIR": str(self.target_dir)}
+        
+        stage = "cargo build" if "--no-run" in cmd else "cargo test"
+        with span(stage, "cargo", project=self.project_dir.name, cmd=" ".join(cmd)) as s:
+            result = run_command(cmd, self.project_dir, env, self._deadline, TestWatch(self.test_timeout))
+            s.set(returncode=result.returncode, timed_out=result.timed_out)
+        self.timed_out = self.timed_out or result.timed_out
+        return result
+    
+    def _check_infra(self, result: CommandResult) -> None:
+        """Flag a cargo run that failed before any test binary or compile error."""
+        if (
+            result.returncode != 0
+            and not result.timed_out
+            and CARGO_COMPILE_ERROR not in result.stdout
+            and CARGO_RUNNING_PATTERN.search(result.stdout) is None
+        ):
+            self.infra_failed = True
+    
+    def _out_of_time(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+    
+    @staticmethod
+    def parse_test_output(
+        output: str,
+        line_times: list[float] | None = None,
+        timed_out: bool = False,
+    ) -> list[tuple]:
+        """
+        Parse libtest result lines into (name, passed) pairs, skipping ignored
+        tests. Given the `line_times` of a `CommandResult`, they're (name,
+        passed, seconds since the binary started its tests) instead: the
+        test's duration when tests run one at a time, an upper bound otherwise.
+        For output `timed_out`, the tests known to be still running when the
+        binary was killed are added as (name, False, seconds, True).
+        """
+        tests = []
+        started = end = 0.0
+        unfinished: dict[str, float] = {}  # name: start of its binary's tests
+        
+        for i, line in enumerate(output.split("\n")):
+            line = line.strip()
+            if not line:
+                continue
+            if line_times is not None:
+                end = line_times[i]
+            
+            if TEST_RUNNING_PATTERN.match(line):
+                started = end
+                continue
+            match = TEST_RESULT_PATTERN.match(line)
+            if not match:
+                running = TEST_STARTED_PATTERN.match(line) or TEST_SLOW_PATTERN.match(line)
+                if running:
+                    unfinished.setdefault(running.group("name"), started)
+                continue
+            
+            unfinished.pop(match.group("name"), None)
+            if match.group("status") == "ignored":
+                continue
+            passed = match.group("status") == "ok"
+            if line_times is None:
+                tests.append((match.group("name"), passed))
+            else:
+                tests.append((match.group("name"), passed, end - started))
+        
+        if timed_out:
+            for name, since in unfinished.items():
+                tests.append((name, False, end - since if line_times is not None else None, True))
+        
+        return tests
+    
+    def _run_single_pass(self) -> tuple[bool, list[tuple]]:
+        """Build once and run every test binary in a single cargo invocation."""
+        # --no-fail-fast keeps going after a failing test binary so that
+        # integration tests still report when unit tests fail
+        if profiling.is_enabled():
+            # build first so the profile can tell compilation from test runs;
+            # the test invocation then finds everything fresh
+            self._run_command(["cargo", "test", "--no-run"])
+        result = self._run_command(["cargo", "test", "--no-fail-fast"])
+        self._check_infra(result)
+        success = result.returncode == 0 and not self.timed_out
+        tests = self.parse_test_output(result.stdout, result.line_times, result.timed_out)
+        
+        if not success and self.verbose:
+            self.output.print(result.stdout)
+        
+        return success, tests
     
     def _enumerate_tests(self) -> list[str]:
         """Extract test names from cargo test --list output."""
         result = self._run_command(["cargo", "test", "--", "--list"])
+        self._check_infra(result)
         output = result.stdout or ""
         
         test_names = []
@@ -80,136 +277,713 @@ class TestRunner:
         
         return test_names
     
-    def _fallback_test_run(self) -> tuple[bool, list[tuple[str, bool]]]:
+    def _fallback_test_run(self) -> tuple[bool, list[tuple]]:
         """Fallback to single cargo test run when enumeration fails."""
         if self.verbose:
-            console.print("[yellow]warning: no tests enumerated. running single cargo test.[/yellow]")
+            self.output.print("[yellow]warning: no tests enumerated. running single cargo test.[/yellow]")
         
         result = self._run_command(["cargo", "test", "-q"])
-        success = result.returncode == 0
+        success = result.returncode == 0 and not self.timed_out
         
         if not success and self.verbose:
-            console.print(result.stdout)
+            self.output.print(result.stdout)
         
         return success, []
     
-    def _run_individual_tests(self, test_names: list[str]) -> tuple[bool, list[tuple[str, bool]]]:
+    def _run_individual_tests(self, test_names: list[str]) -> tuple[bool, list[tuple]]:
         """Run each test individually and collect results."""
         tests = []
         all_passed = True
         
         for i, name in enumerate(test_names, start=1):
+            if self._out_of_time():
+                # the crate's budget is spent, the remaining tests never run
+                self.timed_out = True
+                all_passed = False
+                break
+            
             if self.verbose:
-                console.print(f"running test {i}/{len(test_names)}: {name}")
+                self.output.print(f"running test {i}/{len(test_names)}: {name}")
             
             cmd = ["cargo", "test", name, "--", "--exact", "--nocapture"]
+            started = time.perf_counter()
             result = self._run_command(cmd)
-            passed = result.returncode == 0
+            elapsed = time.perf_counter() - started
+            passed = result.returncode == 0 and not result.timed_out
             
-            tests.append((name, passed))
+            if result.timed_out:
+                tests.append((name, False, elapsed, True))
+            else:
+                # libtest's own report times the test without cargo's startup
+                reported = {test[0]: test for test in self.parse_test_output(result.stdout, result.line_times)}
+                tests.append((name, passed, reported[name][2] if name in reported else elapsed))
             
             if not passed:
                 all_passed = False
                 if self.verbose:
-                    console.print(result.stdout)
+                    self.output.print(result.stdout)
             elif self.verbose:
-                console.print("  -> passed")
+                self.output.print("  -> passed")
         
         return all_passed, tests
 
 
+class WorkspaceTestRunner:
+    """Builds workspace members in one cargo invocation and runs their test binaries."""
+    
+    def __init__(
+        self,
+        workspace_dir: Path,
+        verbose: bool = False,
+        jobs: int = 1,
+        timeout: float | None = None,
+        test_timeout: float | None = None,
+    ):
+        self.workspace_dir = workspace_dir
+        self.verbose = verbose
+        self.jobs = jobs
+        self.timeout = timeout
+        self.test_timeout = test_timeout
+        self.logs: dict[Path, list[str]] = {}
+        self.infra_failed: set[Path] = set()
+    
+    def run_tests(self, project_dirs: list[Path]) -> dict[Path, tuple[bool, list[tuple], float, bool]]:
+        """
+        Run tests for each member and return {project_dir: (success, test_results,
+        elapsed seconds, timed out)}. The shared build isn't part of any member's
+        time; it gets a `timeout` budget of its own, and members it didn't finish
+        compiling in time are reported as timed out. Members whose build failed
+        on an error none of them caused are collected in `infra_failed`.
+        """
+        packages = {
+            project_dir.resolve(): package_name(project_dir / "Cargo.toml")
+            for project_dir in project_dirs
+        }
+        self.logs = {package_dir: [] for package_dir in packages}
+        self.infra_failed = set()
+        executables, failed, unbuilt = self._build(packages)
+        
+        def _test(project_dir: Path) -> tuple[bool, list[tuple], float, bool]:
+            package_dir = project_dir.resolve()
+            if package_dir in failed or package_dir in unbuilt:
+                return False, [], 0.0, package_dir in unbuilt
+            started = time.perf_counter()
+            success, tests, timed_out = self._run_executables(package_dir, executables[package_dir])
+            return success, tests, time.perf_counter() - started, timed_out
+        
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            try:
+                return dict(zip(project_dirs, executor.map(_test, project_dirs)))
+            except BaseException:
+                # don't wait on the workers' test binaries when interrupted
+                kill_running_commands()
+                raise
+    
+    def _build(self, packages: dict[Path, str]) -> tuple[dict[Path, list[str]], set[Path], set[Path]]:
+        """
+        Compile test binaries for all packages, retrying those skipped after a
+        failure. Returns (executables, failed packages, timed out packages).
+        """
+        executables: dict[Path, list[str]] = {}
+        failed: set[Path] = set()
+        timed_out: set[Path] = set()
+        remaining = dict(packages)
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        
+        # cargo stops scheduling new units after the first compile error, so
+        # members that were never reached are rebuilt (mostly fresh) in another
+        # round until the build passes or every failure has been attributed
+        while remaining:
+            cmd = ["cargo", "test", "--no-run", "--message-format=json"]
+            for name in remaining.values():
+                cmd += ["-p", name]
+            
+            with span("cargo build", "cargo", packages=len(remaining), cmd=" ".join(cmd)) as s:
+                result = run_command(cmd, self.workspace_dir, deadline=deadline)
+                s.set(returncode=result.returncode, timed_out=result.timed_out)
+            
+            executables = {package_dir: [] for package_dir in remaining}
+            newly_failed = set()
+            # cargo's own messages, interleaved with the JSON ones on the merged output
+            stderr = []
+            
+            for line in result.stdout.splitlines():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    stderr.append(line)
+                    continue
+                
+                package_dir = Path(message.get("manifest_path", "")).parent.resolve()
+                if package_dir not in remaining:
+                    continue
+                
+                if message.get("reason") == "compiler-artifact":
+                    if message.get("profile", {}).get("test") and message.get("executable"):
+                        executables[package_dir].append(message["executable"])
+                elif message.get("reason") == "compiler-message":
+                    diagnostic = message.get("message", {})
+                    self.logs[package_dir].append(diagnostic.get("rendered") or "")
+                    if diagnostic.get("level") == "error":
+                        newly_failed.add(package_dir)
+            
+            if result.timed_out:
+                # the binaries cargo did report may be unfinished, so nothing
+                # still building is run
+                timed_out = set(remaining) - newly_failed
+                for package_dir in timed_out:
+                    self.logs[package_dir].append("\n".join(stderr))
+                failed |= newly_failed
+                break
+            
+            if result.returncode == 0:
+                break
+            
+            if not newly_failed:
+                # nothing attributable to a member (e.g. a registry or
+                # resolution error), so none of the remaining ones can build
+                newly_failed = set(remaining)
+                self.infra_failed |= newly_failed
+                for package_dir in newly_failed:
+                    self.logs[package_dir].append("\n".join(stderr))
+            
+            failed |= newly_failed
+            remaining = {d: n for d, n in remaining.items() if d not in newly_failed}
+        
+        return executables, failed, timed_out
+    
+    def _run_executables(self, package_dir: Path, executables: list[str]) -> tuple[bool, list[tuple], bool]:
+        """
+        Run a member's test binaries directly, the way `cargo test` would.
+        Returns (success, test_results, timed out).
+        """
+        success = True
+        tests = []
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        
+        for executable in executables:
+            with span("cargo test", "cargo", project=package_dir.name, cmd=executable) as s:
+                result = run_command([executable], package_dir, deadline=deadline, watch=TestWatch(self.test_timeout))
+                s.set(returncode=result.returncode, timed_out=result.timed_out)
+            tests.extend(TestRunner.parse_test_output(result.stdout, result.line_times, result.timed_out))
+            if result.returncode != 0 or result.timed_out:
+                success = False
+                self.logs[package_dir].append(result.stdout)
+            if result.timed_out:
+                return False, tests, True
+        
+        return success, tests, False
+
+
 class ProgressTracker:
     """Manages exercise progress tracking."""
     
-    def __init__(self, progress_file: Path):
-        self.progress_file = progress_file
+    def __init__(self, progress_file: Path, legacy_file: Path | None = None):
+        self.store = ProgressStore(progress_file, legacy_file)
         self.progress = self._load_progress()
     
-    def _load_progress(self) -> dict[str, bool]:
-        """Load progress from JSON file."""
-        if not self.progress_file.exists():
-            return {}
-        
+    def _load_progress(self) -> dict[str, tuple[bool, str | None]]:
+        """Load each project's latest (passed, fingerprint) from the store."""
         try:
-            return json.loads(self.progress_file.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError) as e:
-            console.print(f"[yellow]warning: could not load progress file: {e}[/yellow]")
+            return self.store.latest()
+        except sqlite3.Error as e:
+            console.print(f"[yellow]warning: could not load progress: {e}[/yellow]")
             return {}
     
-    def save_progress(self, results: dict[str, bool]) -> None:
-        """Save progress to JSON file."""
-        self.progress.update(results)
-        
-        try:
-            self.progress_file.parent.mkdir(parents=True, exist_ok=True)
-            self.progress_file.write_text(
-                json.dumps(self.progress, indent=2),
-                encoding="utf-8"
+    def save_progress(
+        self,
+        runs: list[tuple[str, bool, list[tuple], float, bool, bool]],
+        fingerprints: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Append the checked projects' results to the progress history. Projects
+        missing from `fingerprints` are recorded without one, so they're
+        rechecked next time.
+        """
+        fingerprints = fingerprints or {}
+        records = [
+            # a timeout or a broken toolchain/registry says as much about the
+            # machine as about the code, so it's never reused for unchanged
+            # inputs (no fingerprint)
+            CheckRecord(
+                name, passed, None if timed_out or infra_failed else fingerprints.get(name),
+                elapsed, tests, timed_out,
             )
-        except OSError as e:
+            for name, passed, tests, elapsed, timed_out, infra_failed in runs
+        ]
+        try:
+            self.store.record(records)
+        except sqlite3.Error as e:
             console.print(f"[yellow]warning: could not save progress: {e}[/yellow]")
+            return
+        
+        for record in records:
+            self.progress[record.project] = (record.passed, record.fingerprint)
     
     def is_completed(self, project_name: str) -> bool:
         """Check if project is marked as completed."""
-        return self.progress.get(project_name, False)
+        return self.progress.get(project_name, (False, None))[0]
+    
+    def cached_result(self, project_name: str, fingerprint: str) -> bool | None:
+        """Return the recorded result if the project's inputs are unchanged, else None."""
+        passed, recorded = self.progress.get(project_name, (None, None))
+        if recorded is None or recorded != fingerprint:
+            return None
+        return passed
+
+
+@cache
+def toolchain_version() -> str:
+    """Return `rustc -vV` output so that toolchain upgrades invalidate fingerprints."""
+    try:
+        result = subprocess.run(
+            ["rustc", "-vV"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+    except OSError:
+        return ""
+    return result.stdout
+
+
+def project_fingerprint(
+    project_dir: Path,
+    toolchain: str = "",
+    lockfile: Path | None = None,
+    lockfiles: bool = True,
+) -> str:
+    """
+    Hash every input of a crate that can affect its test results. `lockfile`
+    is the workspace's Cargo.lock, which cargo uses instead of the crate's own
+    when the crate is a workspace member. Without `lockfiles`, neither lockfile
+    is hashed, e.g. to compare sources across a run that may write them.
+    """
+    names = FINGERPRINT_FILES if lockfiles else [n for n in FINGERPRINT_FILES if n != "Cargo.lock"]
+    paths = [project_dir / name for name in names]
+    for name in FINGERPRINT_DIRS:
+        paths.extend(p for p in (project_dir / name).rglob("*") if p.is_file())
+    
+    digest = hashlib.sha256(toolchain.encode())
+    for path in sorted(p for p in paths if p.is_file()):
+        digest.update(path.relative_to(project_dir).as_posix().encode() + b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    
+    if lockfiles and lockfile is not None and lockfile.is_file():
+        digest.update(b"workspace Cargo.lock\0")
+        digest.update(hashlib.sha256(lockfile.read_bytes()).digest())
+    
+    return digest.hexdigest()
 
 
-def find_scraper(url: str) -> tuple[str, Callable] | None:
+def fingerprint_projects(project_paths: list[Path], toolchain: str, lockfiles: bool = True) -> dict[str, str]:
+    """Fingerprint each project, including the workspace lockfile for members."""
+    members = set(read_members(EXERCISES_DIR) or [])
+    lockfile = EXERCISES_DIR / "Cargo.lock"
+    return {
+        project_path.parent.name: project_fingerprint(
+            project_path.parent,
+            toolchain,
+            lockfile if member_path(project_path.parent, EXERCISES_DIR) in members else None,
+            lockfiles,
+        )
+        for project_path in project_paths
+    }
+
+
+def load_scraper(scraper: str | Callable) -> Callable:
+    """Resolve a "module:function" registry entry, importing its module on first use."""
+    if callable(scraper):
+        return scraper
+    
+    module_name, _, func_name = scraper.partition(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def find_scraper(url: str, scrapers: dict[str, str | Callable] | None = None) -> tuple[str, Callable] | None:
     """Find appropriate scraper for given URL."""
     try:
         netloc = urlparse(url).netloc
     except Exception:
         return None
     
-    for host, scraper_func in SCRAPERS.items():
+    for host, scraper in (scrapers or SCRAPERS).items():
         if host in netloc:
             source = host.split(".")[0]
-            return source, scraper_func
+            return source, load_scraper(scraper)
     
     return None
 
 
+def read_urls(urls: tuple[str, ...], url_file: TextIO | None = None) -> list[str]:
+    """Collect URLs from arguments and an optional file, skipping blanks, comments and duplicates."""
+    lines = list(urls)
+    if url_file is not None:
+        lines.extend(url_file.read().splitlines())
+    
+    cleaned = (line.strip().rstrip("/") for line in lines)
+    return list(dict.fromkeys(url for url in cleaned if url and not url.startswith("#")))
+
+
+def fetch_problem(url: str) -> tuple[str, dict]:
+    """Scrape a problem and return (source, data)."""
+    scraper_info = find_scraper(url)
+    if not scraper_info:
+        raise ValueError(f"unsupported site '{urlparse(url).netloc}'")
+    
+    source, scraper_func = scraper_info
+    data = scraper_func(url)
+    data["source"] = source
+    
+    return source, data
+
+
+def batch_groups(urls: list[str]) -> list[tuple[str, str | Callable, list[str]]]:
+    """
+    Group the URLs a batch scraper can fetch together, as (host, scraper,
+    urls), for every host with more than one of them.
+    """
+    groups = []
+    for host, batch_scraper in BATCH_SCRAPERS.items():
+        batch_urls = [url for url in urls if host in urlparse(url).netloc]
+        if len(batch_urls) > 1:
+            groups.append((host, batch_scraper, batch_urls))
+    return groups
+
+
+def fetch_batch(host: str, batch_scraper: str | Callable, urls: list[str]) -> list[tuple[str, dict] | Exception]:
+    """Scrape `urls` in one batch, returning (source, data) or the error for each."""
+    source = host.split(".")[0]
+    try:
+        results = load_scraper(batch_scraper)(urls)
+    except Exception as e:
+        return [e] * len(urls)
+    
+    for result in results:
+        if not isinstance(result, Exception):
+            result["source"] = source
+    return [result if isinstance(result, Exception) else (source, result) for result in results]
+
+
+def fetch_problems(
+    urls: list[str],
+    jobs: int = 1,
+    per_host: int = 1,
+) -> Iterator[tuple[str, tuple[str, dict] | Exception]]:
+    """Fetch problems concurrently, yielding (url, result or error) in input order."""
+    host_limits = {
+        netloc: threading.BoundedSemaphore(per_host)
+        for netloc in {urlparse(url).netloc for url in urls}
+    }
+    
+    def _fetch(url: str) -> tuple[str, dict] | Exception:
+        with host_limits[urlparse(url).netloc]:
+            try:
+                return fetch_problem(url)
+            except Exception as e:
+                return e
+    
+    def _fetch_batch(host: str, batch_scraper: str | Callable, batch_urls: list[str]) -> list[tuple[str, dict] | Exception]:
+        with host_limits[urlparse(batch_urls[0]).netloc]:
+            return fetch_batch(host, batch_scraper, batch_urls)
+    
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        
+        for host, batch_scraper, batch_urls in batch_groups(urls):
+            future = executor.submit(_fetch_batch, host, batch_scraper, batch_urls)
+            futures.update((url, (future, i)) for i, url in enumerate(batch_urls))
+        
+        for url in urls:
+            if url not in futures:
+                futures[url] = (executor.submit(_fetch, url), None)
+        
+        for url in urls:
+            future, index = futures[url]
+            result = future.result()
+            yield url, result if index is None else result[index]
+
+
+async def fetch_problems_async(
+    urls: list[str],
+    jobs: int = 1,
+    per_host: int = 1,
+) -> list[tuple[str, tuple[str, dict] | Exception]]:
+    """
+    Fetch problems on one event loop, returning (url, result or error) in
+    input order. Page parsing is offloaded to a process pool so it runs in
+    parallel with the network waits of the other fetches. URLs a batch
+    scraper can fetch together go through it first, as in `fetch_problems`.
+    """
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+    
+    limit = asyncio.Semaphore(jobs)
+    host_limits = {
+        netloc: asyncio.Semaphore(per_host)
+        for netloc in {urlparse(url).netloc for url in urls}
+    }
+    
+    async def _fetch(url: str, executor: Executor) -> tuple[str, dict] | Exception:
+        scraper_info = find_scraper(url, ASYNC_SCRAPERS)
+        if not scraper_info:
+            return ValueError(f"unsupported site '{urlparse(url).netloc}'")
+        
+        source, scraper_func = scraper_info
+        async with limit, host_limits[urlparse(url).netloc]:
+            try:
+                data = await scraper_func(url, executor)
+            except Exception as e:
+                return e
+        
+        data["source"] = source
+        return source, data
+    
+    async def _fetch_batch(host: str, batch_scraper: str | Callable, batch_urls: list[str]) -> list[tuple[str, dict] | Exception]:
+        async with limit, host_limits[urlparse(batch_urls[0]).netloc]:
+            return await asyncio.to_thread(fetch_batch, host, batch_scraper, batch_urls)
+    
+    groups = batch_groups(urls)
+    batched = {url for _, _, batch_urls in groups for url in batch_urls}
+    single = [url for url in urls if url not in batched]
+    
+    with ProcessPoolExecutor() as executor:
+        batch_results, single_results = await asyncio.gather(
+            asyncio.gather(*(_fetch_batch(*group) for group in groups)),
+            asyncio.gather(*(_fetch(url, executor) for url in single)),
+        )
+    
+    results = dict(zip(single, single_results))
+    for (_, _, batch_urls), group_results in zip(groups, batch_results):
+        results.update(zip(batch_urls, group_results))
+    return [(url, results[url]) for url in urls]
+
+
+def create_project(
+    source: str,
+    data: dict,
+    exercises_dir: Path,
+    force: bool = False,
+) -> tuple[str, dict[str, str]]:
+    """Render and write a scraped problem, returning (project name, status of each file)."""
+    from daisy_cli.formatter import render_rust_template
+    from daisy_cli.utils import to_snake_case
+    
+    lib_content = render_rust_template(data, source)
+    project_name = to_snake_case(data["title"])
+    
+    statuses = write_rust_project(project_name, lib_content, exercises_dir, force)
+    
+    return project_name, statuses
+
+
+def report_project(project_name: str, statuses: dict[str, str]) -> None:
+    """Print what writing a project did to each of its files."""
+    if all(status == CREATED for status in statuses.values()):
+        console.print(f"[green]successfully created project: {project_name}[/green]")
+        return
+    if all(status == UNCHANGED for status in statuses.values()):
+        console.print(f"project `{project_name}` is already up to date")
+        return
+    
+    console.print(f"[green]updated project: {project_name}[/green]")
+    for rel_path, status in statuses.items():
+        if status == KEPT:
+            console.print(f"  [yellow]kept {rel_path}: edited since it was generated (--force overwrites it)[/yellow]")
+        elif status == KEPT_NO_MANIFEST:
+            console.print(f"  [yellow]kept {rel_path} (no manifest): differs from the generated file (--force overwrites it)[/yellow]")
+        elif status != UNCHANGED:
+            console.print(f"  {status} {rel_path}")
+
+
 def find_projects() -> list[Path]:
     """Find all Rust projects in exercises directory."""
     if not EXERCISES_DIR.exists():
         console.print(f"[red]error: exercises directory '{EXERCISES_DIR}' not found[/red]")
         raise click.Abort()
     
-    projects = list(EXERCISES_DIR.rglob("Cargo.toml"))
+    projects = discover_projects(EXERCISES_DIR)
     if not projects:
         console.print("[yellow]no rust projects found in exercises directory[/yellow]")
     
     return projects
 
 
-def check_project(project_path: Path, verbose: bool) -> tuple[str, bool, list[tuple[str, bool]]]:
-    """Check a single project and return results."""
+def check_project(
+    project_path: Path,
+    verbose: bool,
+    individual: bool = False,
+    output: Console | None = None,
+    target_dir: Path | None = None,
+    timeout: float | None = None,
+    test_timeout: float | None = None,
+) -> tuple[str, bool, list[tuple], float, bool, bool]:
+    """
+    Check a single project and return (name, success, tests, elapsed seconds,
+    timed out, failed outside the crate's code).
+    """
+    output = output or console
     project_name = project_path.parent.name
-    console.print(f"testing `{project_name}`...")
+    output.print(f"testing `{project_name}`...")
     
-    runner = TestRunner(project_path.parent, verbose)
+    started = time.perf_counter()
+    runner = TestRunner(project_path.parent, verbose, individual, output, target_dir, timeout, test_timeout)
     success, tests = runner.run_tests()
+    elapsed = time.perf_counter() - started
+    report_tests(tests, output, runner.timed_out)
     
+    return project_name, success and not runner.timed_out, tests, elapsed, runner.timed_out, runner.infra_failed
+
+
+def report_tests(tests: list[tuple], output: Console | None = None, timed_out: bool = False) -> None:
+    """Print per-test results for a single project."""
+    output = output or console
+    
+    if timed_out:
+        output.print("- [red]timed out[/red], its cargo and test processes were killed")
     if not tests:
-        console.print("- no individual tests detected")
+        output.print("- no individual tests detected")
     else:
-        for idx, (name, passed) in enumerate(tests, start=1):
+        for idx, test in enumerate(tests, start=1):
+            name, passed, duration, test_timed_out = test_fields(test)
             status_color = "green" if passed else "red"
-            status = f"passed" if passed else "failed"
-            console.print(f"- [cyan]test {idx}[/cyan]:[{status_color}] {status} ({name}) [{status_color}]")
+            status = "timed out" if test_timed_out else "passed" if passed else "failed"
+            timing = f", {duration:.2f}s" if duration is not None else ""
+            output.print(f"- [cyan]test {idx}[/cyan]:[{status_color}] {status} ({name}{timing}) [{status_color}]")
+    
+    output.print()
+
+
+def run_checks(
+    project_paths: list[Path],
+    verbose: bool,
+    individual: bool = False,
+    jobs: int = 1,
+    timeout: float | None = None,
+    test_timeout: float | None = None,
+) -> Iterator[tuple[str, bool, list[tuple], float, bool, bool]]:
+    """Check projects with up to `jobs` workers, reporting in input order."""
+    if jobs <= 1:
+        for project_path in project_paths:
+            yield check_project(project_path, verbose, individual, timeout=timeout, test_timeout=test_timeout)
+        return
+    
+    def _check_buffered(project_path: Path) -> tuple[tuple[str, bool, list[tuple], float, bool, bool], str]:
+        buffer = io.StringIO()
+        output = Console(
+            file=buffer,
+            force_terminal=console.is_terminal,
+            color_system=console.color_system,
+            width=console.width,
+        )
+        # pin each crate to its own target dir so a globally configured
+        # CARGO_TARGET_DIR doesn't serialize the pool on cargo's build lock
+        target_dir = project_path.parent.resolve() / "target"
+        result = check_project(project_path, verbose, individual, output, target_dir, timeout, test_timeout)
+        return result, buffer.getvalue()
+    
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        # map() yields in submission order, so each crate's buffered output
+        # is flushed as soon as it and every crate before it are done
+        try:
+            for result, text in executor.map(_check_buffered, project_paths):
+                console.file.write(text)
+                console.file.flush()
+                yield result
+        except BaseException:
+            # don't wait on the workers' cargo processes when interrupted
+            kill_running_commands()
+            raise
+
+
+def run_workspace_checks(
+    project_paths: list[Path],
+    verbose: bool,
+    jobs: int = 1,
+    timeout: float | None = None,
+    test_timeout: float | None = None,
+) -> Iterator[tuple[str, bool, list[tuple], float, bool, bool]]:
+    """Check projects as members of the exercises workspace with a single build."""
+    if not project_paths:
+        return
     
-    console.print()
+    runner = WorkspaceTestRunner(EXERCISES_DIR, verbose, jobs, timeout, test_timeout)
+    results = runner.run_tests([project_path.parent for project_path in project_paths])
     
-    return project_name, success, tests
+    for project_path in project_paths:
+        project_name = project_path.parent.name
+        success, tests, elapsed, timed_out = results[project_path.parent]
+        console.print(f"testing `{project_name}`...")
+        
+        if not success and verbose:
+            for log in runner.logs[project_path.parent.resolve()]:
+                console.print(log)
+        
+        report_tests(tests, timed_out=timed_out)
+        yield project_name, success, tests, elapsed, timed_out, project_path.parent.resolve() in runner.infra_failed
 
 
-def print_summary(results: dict[str, bool]) -> None:
-    """Print summary of all test results."""
+def print_summary(
+    results: dict[str, bool],
+    timed_out: Collection[str] = (),
+    elapsed: dict[str, float] | None = None,
+) -> None:
+    """Print summary of all test results, with the time of the projects checked in this run."""
+    elapsed = elapsed or {}
     console.print("[bold][u]summary:[/u][/bold]")
     for name, success in results.items():
-        status_text = "(done)" if success else "(pending)"
-        color = "green" if success else "yellow"
-        console.print(f"- `{name}` [{color}]{status_text}[/{color}]")
+        if name in timed_out:
+            status_text, color = "(timed out)", "red"
+        else:
+            status_text = "(done)" if success else "(pending)"
+            color = "green" if success else "yellow"
+        timing = f" {elapsed[name]:.1f}s" if name in elapsed else ""
+        console.print(f"- `{name}` [{color}]{status_text}[/{color}]{timing}")
+
+
+def profile_options(command: Callable) -> Callable:
+    """Add --profile/--profile-out to a command; see `start_profiling`."""
+    command = click.option(
+        "--profile-out",
+        type=click.Path(dir_okay=False, writable=True, path_type=Path),
+        help="Write a Chrome trace-event JSON of the profiled stages to this file",
+    )(command)
+    return click.option(
+        "--profile",
+        is_flag=True,
+        help="Print how long each stage (network, parsing, rendering, cargo, ...) took",
+    )(command)
+
+
+def start_profiling(command: str, profile: bool, profile_out: Path | None) -> None:
+    """Record spans until the command finishes, then report them, even on failure."""
+    if not profile and profile_out is None:
+        return
+    
+    profiling.enable()
+    started = time.perf_counter()
+    
+    def _report():
+        wall_ms = (time.perf_counter() - started) * 1000
+        profiling.disable()
+        if profile:
+            print_profile(wall_ms)
+        if profile_out is not None:
+            profiling.write_trace(profile_out, {"command": command, "argv": sys.argv[1:], "wall_ms": wall_ms})
+            console.print(f"profile trace written to {profile_out}")
+    
+    click.get_current_context().call_on_close(_report)
+
+
+def print_profile(wall_ms: float) -> None:
+    """Print the per-stage breakdown of the recorded spans."""
+    console.print(f"\n[bold]profile[/bold] ({wall_ms:.1f} ms wall, stages may overlap across threads)")
+    console.print(f"  {'stage':<14} {'calls':>6} {'total ms':>11} {'mean ms':>10} {'max ms':>10}")
+    for name, stats in profiling.summarize().items():
+        console.print(
+            f"  {name:<14} {stats.calls:>6} {stats.total_ns / 1e6:>11.1f} "
+            f"{stats.total_ns / stats.calls / 1e6:>10.1f} {stats.max_ns / 1e6:>10.1f}"
+        )
 
 
 @click.group(context_settings={"help_option_names": ["-h", "--help"]})
@@ -218,16 +992,118 @@ def cli():
 
 
 @cli.command("pull")
-@click.argument("url")
-def pull_command(url: str):
-    """Create a Rust project from problem URL."""
-    scraper_info = find_scraper(url)
-    if not scraper_info:
+@click.argument("urls", nargs=-1)
+@click.option(
+    "-f", "--from-file",
+    "url_file",
+    type=click.File("r", encoding="utf-8"),
+    help="Read problem URLs from a file, one per line ('-' for stdin)",
+)
+@click.option(
+    "-j", "--jobs",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Number of problems to fetch concurrently",
+)
+@click.option(
+    "--per-host",
+    type=click.IntRange(min=1),
+    default=2,
+    show_default=True,
+    help="Maximum concurrent requests to the same site",
+)
+@click.option(
+    "--async", "use_async",
+    is_flag=True,
+    help="Fetch on an asyncio event loop and parse pages in a process pool",
+)
+@click.option(
+    "--connect-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=client.CONNECT_TIMEOUT,
+    show_default=True,
+    help="Seconds to wait for the connection to the problem site",
+)
+@click.option(
+    "--read-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=client.READ_TIMEOUT,
+    show_default=True,
+    help="Seconds to wait for the problem site to respond",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=client.MAX_RETRIES,
+    show_default=True,
+    help="Retries with exponential backoff on connection errors, 429 and 5xx",
+)
+@click.option("--offline", is_flag=True, help="Only use cached problem payloads, never the network")
+@click.option("--no-cache", is_flag=True, help="Always fetch from the network and don't cache responses")
+@click.option(
+    "--cache-ttl",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_TTL / 3600,
+    show_default=True,
+    help="Hours before a cached problem payload is revalidated",
+)
+@click.option(
+    "--stream-html",
+    is_flag=True,
+    help="Parse DMOJ pages with a streaming lxml parser instead of a full document tree",
+)
+@click.option("--force", is_flag=True, help="Overwrite generated files even if they were edited since")
+@profile_options
+def pull_command(
+    urls: tuple[str, ...],
+    url_file: TextIO | None,
+    jobs: int,
+    per_host: int,
+    use_async: bool,
+    connect_timeout: float,
+    read_timeout: float,
+    retries: int,
+    offline: bool,
+    no_cache: bool,
+    cache_ttl: float,
+    stream_html: bool,
+    force: bool,
+    profile: bool,
+    profile_out: Path | None,
+):
+    """Create Rust projects from problem URLs (or a file of URLs)."""
+    start_profiling("pull", profile, profile_out)
+    
+    if offline and no_cache:
+        console.print("[red]error: --offline needs the cache, it can't be combined with --no-cache[/red]")
+        raise click.Abort()
+    
+    cache = False if no_cache else ResponseCache(ttl=cache_ttl * 3600, offline=offline)
+    client.configure(connect_timeout, read_timeout, retries, cache)
+    if stream_html:
+        importlib.import_module("daisy_cli.platforms.dmoj").use_streaming_parser()
+    
+    urls = read_urls(urls, url_file)
+    if not urls:
+        console.print("[red]error: no problem URL given[/red]")
+        raise click.Abort()
+    
+    # a single URL keeps the old fail-fast behavior; batches report per URL
+    batch = len(urls) > 1
+    failed = []
+    
+    supported = []
+    for url in urls:
+        if find_scraper(url):
+            supported.append(url)
+            continue
         netloc = urlparse(url).netloc
         console.print(f"[red]error: unsupported site '{netloc}'[/red]")
-        raise click.Abort()
+        failed.append(url)
     
-    source, scraper_func = scraper_info
+    if failed and not batch:
+        raise click.Abort()
 
     cwd = Path.cwd()
     if cwd.name == "exercises":
@@ -235,50 +1111,218 @@ def pull_command(url: str):
     else:
         exercises_dir = cwd / "exercises"
     
-    try:
-        data = scraper_func(url)
-        data["source"] = source
-        
-        lib_content = render_rust_template(data, source)
-        project_name = to_snake_case(data["title"])
-        
-        write_rust_project(project_name, lib_content, exercises_dir)
-        console.print(f"[green]successfully created project: {project_name}[/green]")
-        
-    except Exception as e:
-        console.print(f"[red]error creating project: {e}[/red]")
-        raise click.Abort()
+    if use_async:
+        import asyncio
+        results = asyncio.run(fetch_problems_async(supported, jobs, per_host))
+    else:
+        results = fetch_problems(supported, jobs, per_host)
+    
+    for url, fetched in results:
+        try:
+            if isinstance(fetched, Exception):
+                raise fetched
+            
+            project_name, statuses = create_project(*fetched, exercises_dir, force)
+            report_project(project_name, statuses)
+            
+            if add_workspace_member(exercises_dir, project_name):
+                console.print(f"added `{project_name}` to the exercises workspace")
+            
+        except Exception as e:
+            if not batch:
+                console.print(f"[red]error creating project: {e}[/red]")
+                raise click.Abort()
+            console.print(f"[red]error creating project from {url}: {e}[/red]")
+            failed.append(url)
+    
+    if batch:
+        console.print(f"pulled {len(urls) - len(failed)}/{len(urls)} problems")
+        if failed:
+            sys.exit(1)
 
 
 @cli.command("check")
-@click.option("--recheck", is_flag=True, help="Re-run all exercises regardless of saved state")
+@click.argument("names", nargs=-1)
+@click.option("--recheck", is_flag=True, help="Re-run all exercises, even those unchanged since their last check")
 @click.option("--verbose", is_flag=True, help="Show detailed build/test output")
-def check_command(recheck: bool, verbose: bool):
-    """Check the status of all exercises in the exercises directory."""
+@click.option(
+    "--individual",
+    is_flag=True,
+    help="Run each test in its own cargo invocation (slower, isolates failures)",
+)
+@click.option(
+    "-j", "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of exercises to check in parallel",
+)
+@click.option(
+    "--workspace",
+    is_flag=True,
+    help="Build all exercises as one cargo workspace sharing a single target dir",
+)
+@click.option(
+    "--include",
+    multiple=True,
+    metavar="GLOB",
+    help="Only check exercises matching GLOB: a name ('two_*') or a path ('leetcode/**')",
+)
+@click.option("--exclude", multiple=True, metavar="GLOB", help="Skip exercises matching GLOB")
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    metavar="SECONDS",
+    help="Kill an exercise's cargo and test processes once checking it takes longer than SECONDS",
+)
+@click.option(
+    "--test-timeout",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_TEST_TIMEOUT,
+    show_default=True,
+    metavar="SECONDS",
+    help="Kill a test binary once one of its tests runs longer than SECONDS (0 for no limit)",
+)
+@profile_options
+def check_command(
+    names: tuple[str, ...],
+    recheck: bool,
+    verbose: bool,
+    individual: bool,
+    jobs: int,
+    workspace: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    timeout: float | None,
+    test_timeout: float,
+    profile: bool,
+    profile_out: Path | None,
+):
+    """
+    Check the status of all exercises (or only NAMES) in the exercises directory.
+    Exercises whose sources, manifest and toolchain are unchanged since their
+    last check reuse the recorded result unless --recheck is given.
+    """
+    if workspace and individual:
+        # workspace members run their prebuilt test binaries, not one cargo
+        # invocation per test
+        raise click.UsageError("--individual can't be combined with --workspace")
+    
+    start_profiling("check", profile, profile_out)
+    
     projects = find_projects()
     if not projects:
         return
     
-    tracker = ProgressTracker(PROGRESS_FILE)
-    results = {}
+    if workspace:
+        # every crate below the workspace root must be a member, or cargo
+        # refuses to build it, so register all of them and not just NAMES
+        try:
+            added = sync_workspace(
+                EXERCISES_DIR,
+                [member_path(p.parent, EXERCISES_DIR) for p in projects],
+            )
+        except ValueError as e:
+            console.print(f"[red]error: {e}[/red]")
+            raise click.Abort()
+        if added:
+            console.print(f"added {len(added)} project(s) to the exercises workspace")
     
-    for project_path in projects:
-        project_name = project_path.parent.name
-        
-        # skip if already completed and not rechecking
-        if not recheck and tracker.is_completed(project_name):
-            results[project_name] = True
-            continue
-        
-        project_name, success, _ = check_project(project_path, verbose)
-        results[project_name] = success
+    if names:
+        unknown = set(names) - {p.parent.name for p in projects}
+        if unknown:
+            console.print(f"[red]error: unknown exercise(s): {', '.join(sorted(unknown))}[/red]")
+            raise click.Abort()
+        projects = [p for p in projects if p.parent.name in names]
+    
+    if include or exclude:
+        projects = filter_projects(projects, EXERCISES_DIR, include, exclude)
+        if not projects:
+            console.print("[yellow]no exercises match the --include/--exclude globs[/yellow]")
+            return
+    
+    tracker = ProgressTracker(PROGRESS_DB, LEGACY_PROGRESS_FILE)
+    with span("fingerprint", projects=len(projects)):
+        toolchain = toolchain_version()
+        fingerprints = fingerprint_projects(projects, toolchain)
+    cached = {
+        name: tracker.cached_result(name, fingerprint)
+        for name, fingerprint in fingerprints.items()
+    }
+    
+    # skip if inputs are unchanged since the last check and not rechecking
+    pending = [
+        project_path for project_path in projects
+        if recheck or cached[project_path.parent.name] is None
+    ]
+    
+    # sources only: the run may write lockfiles, but shouldn't change anything else
+    with span("fingerprint", projects=len(pending)):
+        sources = fingerprint_projects(pending, toolchain, lockfiles=False)
+    
+    if workspace:
+        runs = list(run_workspace_checks(pending, verbose, jobs, timeout, test_timeout))
+    else:
+        runs = list(run_checks(pending, verbose, individual, jobs, timeout, test_timeout))
+    checked = {project_name: success for project_name, success, *_ in runs}
+    results = {
+        project_path.parent.name: checked.get(project_path.parent.name, cached[project_path.parent.name])
+        for project_path in projects
+    }
     
-    tracker.save_progress(results)
-    print_summary(results)
+    # cargo writes Cargo.lock on a crate's first run, so the result is saved
+    # with the fingerprint taken after it; unless the sources were edited
+    # during the run, then it belongs to neither and the crate is rechecked
+    with span("fingerprint", projects=len(pending)):
+        edited = {
+            name for name, fingerprint in fingerprint_projects(pending, toolchain, lockfiles=False).items()
+            if fingerprint != sources[name]
+        }
+        fingerprints.update(fingerprint_projects(pending, toolchain))
+    tracker.save_progress(runs, {name: f for name, f in fingerprints.items() if name not in edited})
+    print_summary(
+        results,
+        timed_out={project_name for project_name, _, _, _, timed_out, _ in runs if timed_out},
+        elapsed={project_name: elapsed for project_name, _, _, elapsed, _, _ in runs},
+    )
     
     if not all(results.values()):
         sys.exit(1)
 
 
+@cli.command("history")
+@click.option(
+    "--slowest",
+    type=click.IntRange(min=0),
+    default=5,
+    show_default=True,
+    help="Number of slowest exercises to list",
+)
+def history_command(slowest: int):
+    """Show failing exercises since when, and the slowest ones, from past checks."""
+    if not PROGRESS_DB.exists() and not LEGACY_PROGRESS_FILE.exists():
+        console.print("[yellow]no check history yet, run `daisy check` first[/yellow]")
+        return
+    
+    store = ProgressStore(PROGRESS_DB, LEGACY_PROGRESS_FILE)
+    failing = store.failing_since()
+    
+    console.print("[bold][u]failing:[/u][/bold]")
+    if not failing:
+        console.print("- [green]nothing, every checked exercise passes[/green]")
+    for entry in failing:
+        since = datetime.fromtimestamp(entry.since).strftime("%Y-%m-%d %H:%M")
+        runs = "1 run" if entry.runs == 1 else f"{entry.runs} runs"
+        last = ", last one timed out" if entry.timed_out else ""
+        console.print(f"- `{entry.project}` [yellow]since {since}[/yellow] ({runs}{last})")
+        for test_name, timed_out in store.failing_tests(entry.project):
+            console.print(f"  - [red]{test_name}[/red]{' (timed out)' if timed_out else ''}")
+    
+    if slowest:
+        console.print("[bold][u]slowest:[/u][/bold]")
+        for project, duration in store.slowest(slowest):
+            console.print(f"- `{project}` {duration:.1f}s")
+
+
 if __name__ == "__main__":
     cli()
\ No newline at end of file
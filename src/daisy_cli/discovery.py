@@ -0,0 +1,122 @@
+import json
+import os
+import time
+from collections.abc import Iterable
+from pathlib import Path, PurePosixPath
+
+from daisy_cli.writer import write_atomic
+
+INDEX_FILE = ".daisy_projects.json"
+INDEX_VERSION = 1
+MANIFEST = "Cargo.toml"
+# cargo build output, tens of thousands of files that are never exercises
+PRUNED_DIRS = frozenset({"target"})
+# a directory changed within this window of the scan may change again
+# without its mtime moving (coarse timestamps), so it's never trusted
+RACY_WINDOW_NS = 2_000_000_000
+
+def _scan_dir(path: Path) -> dict:
+    """List what discovery needs from one directory: is it a crate, and its subdirs."""
+    entries = list(os.scandir(path))
+    return {
+        "crate": any(entry.name == MANIFEST and entry.is_file() for entry in entries),
+        "children": sorted(
+            entry.name for entry in entries
+            if not entry.name.startswith(".")
+            and entry.name not in PRUNED_DIRS
+            and entry.is_dir(follow_symlinks=False)
+        ),
+    }
+
+def _walk(root: Path, index: dict[str, dict]) -> tuple[list[str], dict[str, dict], bool]:
+    """
+    Walk `root` for crates, reusing `index` entries ({rel dir: {"mtime",
+    "crate", "children"}}) for directories whose mtime hasn't moved, so an
+    unchanged tree costs one stat per directory. Hidden and PRUNED_DIRS
+    directories are skipped, and so is anything below a crate, so nested or
+    vendored manifests are never picked up.
+    Returns (crate dirs, new index, whether any entry changed).
+    """
+    racy_after = time.time_ns() - RACY_WINDOW_NS
+    crates = []
+    new_index = {}
+    changed = False
+    stack = [""]
+
+    while stack:
+        rel_dir = stack.pop()
+        path = root / rel_dir if rel_dir else root
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+            entry = index.get(rel_dir)
+            if entry is None or entry["mtime"] != mtime_ns or mtime_ns >= racy_after:
+                scanned = {"mtime": mtime_ns, **_scan_dir(path)}
+                changed = changed or scanned != entry
+                entry = scanned
+        except OSError:
+            changed = True
+            continue
+        new_index[rel_dir] = entry
+
+        # the root's own manifest is the exercises workspace, not an exercise
+        if rel_dir and entry["crate"]:
+            crates.append(rel_dir)
+            continue
+        stack.extend(f"{rel_dir}/{name}" if rel_dir else name for name in entry["children"])
+
+    changed = changed or new_index.keys() != index.keys()
+    return sorted(crates), new_index, changed
+
+def _load_index(root: Path) -> dict[str, dict]:
+    try:
+        index = json.loads((root / INDEX_FILE).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return {}
+    return index.get("dirs", {})
+
+def discover_projects(root: Path, use_index: bool = True) -> list[Path]:
+    """
+    Return the manifest of every exercise crate below `root`. Directory
+    listings are indexed in `root`, so the next call only re-reads the
+    directories that changed instead of walking the whole tree.
+    """
+    index = _load_index(root) if use_index else {}
+    try:
+        crates, new_index, changed = _walk(root, index)
+    except (KeyError, TypeError):
+        # malformed index entries: start over without it
+        crates, new_index, changed = _walk(root, {})
+
+    if use_index and changed and root.is_dir():
+        try:
+            write_atomic(root / INDEX_FILE, json.dumps({"version": INDEX_VERSION, "dirs": new_index}) + "\n")
+        except OSError:
+            pass  # a read-only tree still works, just without the index
+
+    return [root / rel_dir / MANIFEST for rel_dir in crates]
+
+def _matches(rel_dir: PurePosixPath, pattern: str) -> bool:
+    # bare patterns ("two_*") match the crate's name, others its relative path
+    if "/" in pattern:
+        return rel_dir.full_match(pattern)
+    return PurePosixPath(rel_dir.name).full_match(pattern)
+
+def filter_projects(
+    projects: list[Path],
+    root: Path,
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+) -> list[Path]:
+    """Keep projects matching any `include` glob (all if none) and no `exclude` glob."""
+    include, exclude = list(include), list(exclude)
+    kept = []
+    for manifest in projects:
+        rel_dir = PurePosixPath(manifest.parent.relative_to(root).as_posix())
+        if include and not any(_matches(rel_dir, pattern) for pattern in include):
+            continue
+        if any(_matches(rel_dir, pattern) for pattern in exclude):
+            continue
+        kept.append(manifest)
+    return kept
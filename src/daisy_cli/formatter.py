@@ -1,15 +1,72 @@
+import json
+import os
+import re
 import textwrap
+from functools import cache
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 
+from daisy_cli.platforms.cache import CACHE_DIR
+from daisy_cli.profiling import traced
 from daisy_cli.utils import to_snake_case
 
 INDOC_VERSION       = "2.0.6"
 DMOJ_VERSION        = "0.1.5"
 ASSERT_CMD_VERSION  = "2.0.17"
+SERDE_JSON_VERSION  = "1.0.140"
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
+# opt-in: compiled templates are persisted across runs only when set
+BYTECODE_CACHE_DIR = CACHE_DIR / "templates" if os.environ.get("DAISY_TEMPLATE_CACHE") else None
+TEMPLATE_NAMES = {
+    "leetcode": ("lib.rs.j2", "Cargo.toml.j2"),
+    "dmoj": ("main.rs.j2", "cli.rs.j2", "Cargo.toml.j2"),
+    "codeforces": ("main.rs.j2", "cli.rs.j2", "Cargo.toml.j2"),
+}
+
+# once a generated file's samples (inputs + outputs) add up to more than
+# this, the largest are written to SAMPLE_DATA_DIR and included by the tests
+# instead of inlined into the file
+MAX_INLINE_SAMPLE_BYTES = 4 * 1024
+SAMPLE_DATA_DIR = "tests/data"
+SIGNATURE_PATTERN = re.compile(r"pub\s+fn\s+\w+\s*\((.*)\)\s*->\s*([^{]+?)\s*\{?\s*$")
+# types serde_json can build from a LeetCode literal
+DESERIALIZABLE_TYPE_PATTERN = re.compile(r"(?:(?:Vec|Option)<)*(?:i32|i64|u32|u64|usize|f64|bool|char|String)>*")
+
+@cache
+def get_environment(source: str, bytecode_cache_dir: Path | None = BYTECODE_CACHE_DIR) -> Environment:
+    """
+    Return the process-wide Jinja environment for `source`. Compiled templates
+    stay in the environment's cache, and with `bytecode_cache_dir` set (by
+    default when DAISY_TEMPLATE_CACHE is) they are also persisted so later CLI
+    runs skip compilation.
+    """
+    if source not in TEMPLATE_NAMES:
+        raise ValueError(f"Unknown source: {source}")
+
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        try:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+        except OSError:
+            bytecode_cache = None
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR / source),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=bytecode_cache,
+        # templates ship with the package, no need to stat them on every lookup
+        auto_reload=False,
+    )
+
+@cache
+def get_templates(source: str) -> dict[str, Template]:
+    """Load (and compile) every template used for `source` once per process."""
+    env = get_environment(source)
+    return {name: env.get_template(name) for name in TEMPLATE_NAMES[source]}
 
 def format_samples(inputs: list[str], outputs: list[str], explanations: list[str], varnames: list[list[str]]) -> list[dict]:
     def _normalize_indent(s):
@@ -30,13 +87,117 @@ def format_samples(inputs: list[str], outputs: list[str], explanations: list[str
         for i, (inn, out) in enumerate(zip(inputs, outputs))
     ]
 
-def render_rust_template(data: dict, source: str) -> dict:
-    env = Environment(
-        loader=FileSystemLoader(TEMPLATES_DIR / source),
-        trim_blocks=True,
-        lstrip_blocks=True
+def _split_params(params: str) -> list[str]:
+    # commas inside generics (HashMap<i32, i32>) don't separate parameters
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(params):
+        if ch == "<":
+            depth += 1
+        elif ch == ">":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(params[start:i])
+            start = i + 1
+    parts.append(params[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+def _signature_types(signature: str | None) -> tuple[dict[str, str], str] | None:
+    """({parameter: type}, return type) of a LeetCode Rust signature."""
+    match = SIGNATURE_PATTERN.search(signature or "")
+    if not match:
+        return None
+    params = {}
+    for param in _split_params(match.group(1)):
+        name, _, param_type = param.partition(":")
+        params[name.removeprefix("mut ").strip()] = param_type.strip()
+    return params, match.group(2).strip()
+
+def _is_deserializable(rust_type: str | None) -> bool:
+    return bool(
+        rust_type
+        and DESERIALIZABLE_TYPE_PATTERN.fullmatch(rust_type)
+        and rust_type.count("<") == rust_type.count(">")
     )
 
+def _leetcode_sample_data(sample: dict, literals: dict, types: tuple[dict[str, str], str]) -> dict[str, str] | None:
+    """
+    Data files for a LeetCode sample, one JSON literal per argument plus the
+    expected value, deserialized by the test with serde_json. None when a
+    type or literal can't take that route (e.g. TreeNode, 'single quotes').
+    """
+    params, return_type = types
+    values = [(name, literals["inputs"].get(name), params.get(name)) for name in sample["varnames"]]
+    values.append(("expected", literals["output"], return_type))
+    if not all(raw is not None and _is_deserializable(rust_type) for _, raw, rust_type in values):
+        return None
+    try:
+        for _, raw, _ in values:
+            json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+    files = {}
+    sample["data"] = []
+    for name, raw, rust_type in values:
+        path = f"{SAMPLE_DATA_DIR}/{sample['name']}_{name}.json"
+        files[path] = raw
+        # relative to src/lib.rs, where the tests live
+        sample["data"].append({"name": name, "type": rust_type, "path": f"../{path}"})
+    return files
+
+def externalize_samples(
+    samples: list[dict],
+    data: dict,
+    source: str,
+    max_inline_bytes: int = MAX_INLINE_SAMPLE_BYTES,
+) -> dict[str, str]:
+    """
+    Move samples out of the generated sources, largest first, until the ones
+    left inline add up to at most `max_inline_bytes`, so rustc doesn't have
+    to compile huge literals. All samples of a problem go into the same
+    source file (src/lib.rs or tests/cli.rs). Each moved sample gets a "data"
+    entry for the templates to include, and the data files are returned as
+    {path: content}, to be written with the project's files.
+    """
+    files = {}
+    types = _signature_types(data.get("rust_signature")) if source == "leetcode" else None
+    literals = data.get("sample_literals", [])
+
+    # UTF-8 size, as written into the sources: statements aren't all ASCII
+    sizes = [len(sample["input"].encode()) + len(sample["output"].encode()) for sample in samples]
+    inline_bytes = sum(sizes)
+
+    for i in sorted(range(len(samples)), key=sizes.__getitem__, reverse=True):
+        if inline_bytes <= max_inline_bytes:
+            break
+        sample = samples[i]
+        if source == "leetcode":
+            if types is None or i >= len(literals):
+                continue
+            sample_files = _leetcode_sample_data(sample, literals[i], types)
+            if sample_files is None:
+                continue  # stays inline
+            files.update(sample_files)
+        else:
+            # stdin/stdout samples, included from tests/cli.rs
+            input_path = f"{SAMPLE_DATA_DIR}/{sample['name']}.in"
+            output_path = f"{SAMPLE_DATA_DIR}/{sample['name']}.out"
+            files[input_path] = sample["input"]
+            files[output_path] = sample["output"]
+            sample["data"] = {"input": input_path.removeprefix("tests/"), "output": output_path.removeprefix("tests/")}
+        inline_bytes -= sizes[i]
+
+    return files
+
+@traced("render", "formatter")
+def render_rust_template(data: dict, source: str, max_inline_sample: int = MAX_INLINE_SAMPLE_BYTES) -> dict:
+    """
+    Render the project files for a scraped problem, as {relative path:
+    content}. Samples beyond `max_inline_sample` bytes in total are written
+    as data files under tests/data (see `externalize_samples`).
+    """
+    templates = get_templates(source)
+
     fn_name = to_snake_case(data["title"])
 
     if data.get("rust_signature"):
@@ -50,10 +211,11 @@ def render_rust_template(data: dict, source: str) -> dict:
         data.get("sample_explanations", []),
         data.get("sample_varnames", [])
     )
+    data_files = externalize_samples(samples, data, source, max_inline_sample)
 
     if source == "leetcode":
         return {
-            "src/lib.rs": env.get_template("lib.rs.j2").render(
+            "src/lib.rs": templates["lib.rs.j2"].render(
                 title=data["title"],
                 description=data["description"],
                 constraints=data.get("constraints"),
@@ -67,14 +229,18 @@ def render_rust_template(data: dict, source: str) -> dict:
                 use_indoc=data.get("rust_signature") is None,
                 samples=samples,
             ),
-            "Cargo.toml": env.get_template("Cargo.toml.j2").render(
-                name=to_snake_case(data["title"])
-            )
+            "Cargo.toml": templates["Cargo.toml.j2"].render(
+                name=to_snake_case(data["title"]),
+                serde_json_version=SERDE_JSON_VERSION if data_files else None,
+            ),
+            **data_files,
         }
     elif source == "dmoj":
         return {
-            "src/main.rs": env.get_template("main.rs.j2").render(
+            "src/main.rs": templates["main.rs.j2"].render(
                 title=data["title"],
+                points=data.get("points"),
+                limits=data.get("limits"),
                 description=data["description"],
                 constraints=data.get("constraints"),
                 constraints_header=data.get("constraints_header", ""),
@@ -83,16 +249,47 @@ def render_rust_template(data: dict, source: str) -> dict:
                 output_header=data.get("output_header", ""),
                 output_spec=data.get("output_spec", ""),
             ),
-            "tests/cli.rs": env.get_template("cli.rs.j2").render(
+            "tests/cli.rs": templates["cli.rs.j2"].render(
                 name=to_snake_case(data["title"]),
-                samples=samples
+                samples=samples,
+                # samples moved to tests/data are included as they are
+                use_indoc=any("data" not in s for s in samples),
             ),
-            "Cargo.toml": env.get_template("Cargo.toml.j2").render(
+            "Cargo.toml": templates["Cargo.toml.j2"].render(
                 name=to_snake_case(data["title"]),
                 indoc_version=INDOC_VERSION,
                 dmoj_version=DMOJ_VERSION,
                 assert_cmd_version=ASSERT_CMD_VERSION
-            )
+            ),
+            **data_files,
+        }
+    elif source == "codeforces":
+        # judged as a single file, so the template sticks to std (no dmoj crate)
+        return {
+            "src/main.rs": templates["main.rs.j2"].render(
+                title=data["title"],
+                rating=data.get("rating"),
+                tags=data.get("tags", []),
+                description=data["description"],
+                constraints=data.get("constraints"),
+                constraints_header=data.get("constraints_header", ""),
+                input_header=data.get("input_header", ""),
+                input_spec=data.get("input_spec", ""),
+                output_header=data.get("output_header", ""),
+                output_spec=data.get("output_spec", ""),
+            ),
+            "tests/cli.rs": templates["cli.rs.j2"].render(
+                name=to_snake_case(data["title"]),
+                samples=samples,
+                # samples moved to tests/data are included as they are
+                use_indoc=any("data" not in s for s in samples),
+            ),
+            "Cargo.toml": templates["Cargo.toml.j2"].render(
+                name=to_snake_case(data["title"]),
+                indoc_version=INDOC_VERSION,
+                assert_cmd_version=ASSERT_CMD_VERSION
+            ),
+            **data_files,
         }
     else:
         raise ValueError(f"Unknown source: {source}")
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("DAISY_CACHE_DIR") or Path.home() / ".cache" / "daisy")
+DEFAULT_TTL = 7 * 24 * 60 * 60  # one week
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+# eviction frees down to this share of `max_bytes`, so a cache sitting at the
+# limit isn't rescanned on every store
+EVICT_TO = 0.9
+
+class OfflineCacheMiss(LookupError):
+    """Raised in offline mode when a payload has never been cached."""
+
+@dataclass
+class CachedResponse:
+    body: str
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+class ResponseCache:
+    """
+    Stores raw scraped payloads on disk, one JSON file per (platform, key).
+    Entries older than `ttl` are revalidated with their ETag/Last-Modified,
+    and the least recently used ones are evicted past `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = MAX_CACHE_BYTES,
+        offline: bool = False,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        # bytes on disk as of the last scan plus this process's own writes;
+        # None until the first store scans the directory
+        self._size: int | None = None
+        self._size_lock = threading.Lock()
+
+    def _path(self, platform: str, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / platform / f"{digest}.json"
+
+    def load(self, platform: str, key: str) -> CachedResponse | None:
+        path = self._path(platform, key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            response = CachedResponse(
+                body=entry["body"],
+                fetched_at=entry["fetched_at"],
+                etag=entry.get("etag"),
+                last_modified=entry.get("last_modified"),
+            )
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+        try:
+            # bump mtime so eviction is least-recently-used, not oldest-written
+            os.utime(path)
+        except OSError:
+            pass  # e.g. a read-only cache, still usable
+
+        return response
+
+    def store(self, platform: str, key: str, response: CachedResponse) -> None:
+        path = self._path(platform, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "key": key,
+            "fetched_at": response.fetched_at,
+            "etag": response.etag,
+            "last_modified": response.last_modified,
+            "body": response.body,
+        }
+
+        # write to a sibling temp file and rename, so concurrent readers
+        # never see a half-written entry
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            written = os.path.getsize(tmp_name)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        # other processes' writes only show up at the next scan, which is
+        # close enough for a size limit
+        with self._size_lock:
+            if self._size is not None:
+                self._size += written - replaced
+            if self._size is None or self._size > self.max_bytes:
+                self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries once the cache exceeds `max_bytes`."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+        self._size = total
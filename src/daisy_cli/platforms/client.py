@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from daisy_cli.platforms.cache import CachedResponse, OfflineCacheMiss, ResponseCache
+from daisy_cli.profiling import span
+
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+POOL_SIZE = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+}
+
+# requests/urllib3 are imported on first use, keeping them off the startup
+# path of commands that never scrape
+if TYPE_CHECKING:
+    import requests
+
+_timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+_retries = MAX_RETRIES
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_cache: ResponseCache | None = ResponseCache()
+
+def create_session(
+    retries: int = MAX_RETRIES,
+    backoff_factor: float = BACKOFF_FACTOR,
+    pool_size: int = POOL_SIZE,
+) -> requests.Session:
+    """
+    Build a keep-alive session that retries connection errors and
+    429/5xx responses with exponential backoff, honouring Retry-After.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        # LeetCode's GraphQL queries are read-only, so POST is safe to retry
+        allowed_methods=None,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def configure(
+    connect_timeout: float | None = None,
+    read_timeout: float | None = None,
+    retries: int | None = None,
+    cache: ResponseCache | None | bool = True,
+) -> None:
+    """
+    Override the default timeouts/retries used by `get_session`, `get` and `post`.
+    `cache` replaces the response cache used by `fetch_text`; False disables
+    it and True keeps the current one.
+    """
+    global _timeout, _retries, _session, _cache
+    with _session_lock:
+        if cache is not True:
+            _cache = cache or None
+        _timeout = (
+            connect_timeout if connect_timeout is not None else _timeout[0],
+            read_timeout if read_timeout is not None else _timeout[1],
+        )
+        if retries is not None and retries != _retries:
+            _retries = retries
+            _session = None
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session(retries=_retries)
+        return _session
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", _timeout)
+    with span("network", "http", method=method, url=url) as s:
+        response = get_session().request(method, url, **kwargs)
+        s.set(status=response.status_code)
+    return response
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+def is_offline() -> bool:
+    return bool(_cache and _cache.offline)
+
+def lookup_cached(platform: str, key: str) -> str | None:
+    """Return a cached body usable without a request: fresh, or any in offline mode."""
+    cache = _cache
+    cached = cache.load(platform, key) if cache else None
+    if cached and (cache.offline or cached.is_fresh(cache.ttl)):
+        return cached.body
+    return None
+
+def store_text(platform: str, key: str, body: str) -> None:
+    """Cache a body obtained outside `fetch_text`, e.g. split from a batched response."""
+    if _cache:
+        _cache.store(platform, key, CachedResponse(body=body, fetched_at=time.time()))
+
+def fetch_text(
+    platform: str,
+    key: str,
+    method: str,
+    url: str,
+    validate: Callable[[str], bool] | None = None,
+    **kwargs,
+) -> str:
+    """
+    Return the response body for `url`, going through the response cache
+    under (platform, key). Fresh entries are served without a request; stale
+    ones are revalidated with If-None-Match/If-Modified-Since. Bodies that
+    fail `validate` are returned but never cached.
+    """
+    cache = _cache
+    cached = cache.load(platform, key) if cache else None
+
+    if cache and cache.offline:
+        if cached is None:
+            raise OfflineCacheMiss(f"'{key}' is not cached and offline mode is on")
+        return cached.body
+
+    if cached and cached.is_fresh(cache.ttl):
+        return cached.body
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+
+    response = request(method, url, headers=headers, **kwargs)
+
+    if response.status_code == 304 and cached:
+        cached.fetched_at = time.time()
+        cache.store(platform, key, cached)
+        return cached.body
+
+    response.raise_for_status()
+    body = response.text
+
+    if cache and (validate is None or validate(body)):
+        cache.store(platform, key, CachedResponse(
+            body=body,
+            fetched_at=time.time(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        ))
+
+    return body
+
+async def fetch_text_async(
+    platform: str,
+    key: str,
+    method: str,
+    url: str,
+    validate: Callable[[str], bool] | None = None,
+    **kwargs,
+) -> str:
+    """
+    Awaitable `fetch_text`. The blocking request runs on the loop's default
+    thread pool, so concurrent fetches overlap while still sharing the pooled
+    session, retries and response cache.
+    """
+    import asyncio
+
+    return await asyncio.to_thread(fetch_text, platform, key, method, url, validate, **kwargs)
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import os
+import re
+import threading
+from concurrent.futures import Executor
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from daisy_cli.platforms import client
+from daisy_cli.profiling import traced
+from daisy_cli.utils import TEXT_TYPES, format_codeforces_text
+
+# overridable so the scraper can run against a local stub server
+BASE_URL = os.environ.get("DAISY_CODEFORCES_URL", "https://codeforces.com").rstrip("/")
+PROBLEMSET_KEY = "problemset.problems"
+
+LIMITS_HEADER = "Limits"
+# "A. Watermelon", "B2. Hard Version"
+TITLE_PREFIX_PATTERN = re.compile(r"^[A-Z]\d*\.\s*")
+# /problemset/problem/4/A or /contest/4/problem/A
+URL_PATTERNS = (
+    re.compile(r"^/problemset/problem/(\d+)/([A-Z]\d*)/?$"),
+    re.compile(r"^/contest/(\d+)/problem/([A-Z]\d*)/?$"),
+)
+
+_index: dict[str, dict] | None = None
+_index_lock = threading.Lock()
+
+def problem_from_url(url: str) -> tuple[int, str]:
+    """
+    Extracts (contest id, problem index) from a Codeforces problem URL.
+    """
+    path = urlparse(url).path
+    for pattern in URL_PATTERNS:
+        match = pattern.match(path)
+        if match:
+            return int(match.group(1)), match.group(2)
+    raise ValueError(f"Invalid Codeforces problem URL: {url}")
+
+def _api_result(payload: str) -> dict | None:
+    try:
+        response = json.loads(payload)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(response, dict) or response.get("status") != "OK":
+        return None
+    return response.get("result")
+
+def _index_problems(problems: list[dict]) -> dict[str, dict]:
+    return {
+        f"{problem['contestId']}{problem['index']}": {
+            "name": problem["name"],
+            "rating": problem.get("rating"),
+            "tags": problem.get("tags", []),
+        }
+        for problem in problems
+        if "contestId" in problem
+    }
+
+def _fetch_api(key: str, method: str) -> dict:
+    payload = client.fetch_text(
+        "codeforces", key, "GET", f"{BASE_URL}/api/{method}",
+        validate=lambda p: _api_result(p) is not None,
+    )
+    result = _api_result(payload)
+    if result is None:
+        raise ValueError(f"Codeforces API call '{method}' failed")
+    return result
+
+def load_index() -> dict[str, dict]:
+    """
+    Return the local problem index, {"1850A": {"name", "rating", "tags"}},
+    built from the whole problemset in one `problemset.problems` call. The
+    response is cached like any other payload, and parsed once per process.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = _index_problems(_fetch_api(PROBLEMSET_KEY, "problemset.problems")["problems"])
+        return _index
+
+def _contest_problems(contest_id: int) -> dict[str, dict]:
+    # recent contests reach the problemset only after the round is over
+    try:
+        result = _fetch_api(
+            f"contest/{contest_id}",
+            f"contest.standings?contestId={contest_id}&from=1&count=1",
+        )
+    except requests.HTTPError as e:
+        # the API answers 400 for unknown (or private) contests
+        if e.response is not None and e.response.status_code == 400:
+            return {}
+        raise
+    return _index_problems(result["problems"])
+
+def lookup_problem(contest_id: int, index: str) -> dict:
+    """Index entry of a problem, checking its contest when the problemset lacks it."""
+    problem_id = f"{contest_id}{index}"
+    problem = load_index().get(problem_id) or _contest_problems(contest_id).get(problem_id)
+    if problem is None:
+        raise ValueError(f"Codeforces problem {problem_id} not found")
+    return problem
+
+def _fetch_statement(contest_id: int, index: str) -> str:
+    url = f"{BASE_URL}/contest/{contest_id}/problem/{index}"
+    return client.fetch_text("codeforces", f"{contest_id}/{index}", "GET", url)
+
+def _with_metadata(data: dict, problem: dict) -> dict:
+    data["rating"] = problem["rating"]
+    data["tags"] = problem["tags"]
+    return data
+
+def extract_problem_parts(url: str) -> dict:
+    contest_id, index = problem_from_url(url)
+    problem = lookup_problem(contest_id, index)
+    return _with_metadata(parse_problem_html(_fetch_statement(contest_id, index)), problem)
+
+async def extract_problem_parts_async(url: str, executor: Executor | None = None) -> dict:
+    """
+    Async `extract_problem_parts`: the index lookup and page fetch overlap
+    with other fetches and parsing runs on `executor` (e.g. a process pool).
+    """
+    contest_id, index = problem_from_url(url)
+    problem = await asyncio.to_thread(lookup_problem, contest_id, index)
+    html = await asyncio.to_thread(_fetch_statement, contest_id, index)
+    loop = asyncio.get_running_loop()
+    return _with_metadata(await loop.run_in_executor(executor, parse_problem_html, html), problem)
+
+def _pre_text(pre: Tag) -> str:
+    # samples are either one line per <div class="test-example-line"> or
+    # plain text broken with <br>
+    lines = pre.find_all("div", class_="test-example-line")
+    if lines:
+        return "\n".join(line.get_text() for line in lines)
+    return "".join(
+        "\n" if node.name == "br" else node
+        for node in pre.descendants
+        if node.name == "br" or type(node) in TEXT_TYPES
+    )
+
+def _section_text(section: Tag | None) -> tuple[str | None, str]:
+    """(title, formatted paragraphs) of a spec section."""
+    if section is None:
+        return None, ""
+    title = section.find("div", class_="section-title")
+    paragraphs = [format_codeforces_text(p.get_text()) for p in section.find_all("p")]
+    return title.get_text(strip=True) if title else None, "\n\n".join(paragraphs)
+
+def _limit_text(header: Tag, class_name: str) -> str | None:
+    limit = header.find("div", class_=class_name)
+    if limit is None:
+        return None
+    name = limit.find("div", class_="property-title")
+    value = "".join(node for node in limit.children if type(node) in TEXT_TYPES).strip()
+    return f"{name.get_text(strip=True)}: {value}" if name else value
+
+@traced("parse", "codeforces")
+def parse_problem_html(html: str) -> dict:
+    """
+    Extract the problem parts from a statement page's div.problem-statement:
+    the header (title and limits), the legend, the input/output
+    specifications and the sample tests.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    statement = soup.find("div", class_="problem-statement")
+    header = statement.find("div", class_="header") if statement else None
+    title = header.find("div", class_="title") if header else None
+    if title is None:
+        raise ValueError("No problem statement found in the HTML content.")
+
+    # the legend is the unnamed <div> right after the header
+    legend = header.find_next_sibling("div")
+    description_parts = []
+    if legend is not None and not legend.get("class"):
+        for node in legend.find_all(["p", "li"]):
+            text = format_codeforces_text(node.get_text())
+            description_parts.append(f"- {text}" if node.name == "li" else text)
+
+    limits = [_limit_text(header, name) for name in ("time-limit", "memory-limit")]
+    input_header, input_spec = _section_text(statement.find("div", class_="input-specification"))
+    output_header, output_spec = _section_text(statement.find("div", class_="output-specification"))
+    if input_header is None or output_header is None:
+        raise ValueError("Could not find all required section headers.")
+
+    sample_inputs, sample_outputs = [], []
+    for sample in statement.select("div.sample-test div.input pre, div.sample-test div.output pre"):
+        samples = sample_inputs if "input" in sample.parent.get("class", []) else sample_outputs
+        samples.append(_pre_text(sample).strip())
+
+    return {
+        "title": TITLE_PREFIX_PATTERN.sub("", title.get_text(strip=True)),
+        "description": "\n\n".join(description_parts),
+        "constraints": "\n".join(limit for limit in limits if limit) or None,
+        "input_spec": input_spec,
+        "output_spec": output_spec,
+        "constraints_header": LIMITS_HEADER,
+        "input_header": input_header,
+        "output_header": output_header,
+        "sample_inputs": sample_inputs,
+        "sample_outputs": sample_outputs,
+    }
@@ -1,70 +1,418 @@
+import asyncio
+import json
+import os
+import re
+from collections.abc import Callable
+from concurrent.futures import Executor
+from functools import partial
+from urllib.parse import urlparse
+
 import requests
 from bs4 import BeautifulSoup
 
-from daisy_cli.utils import extract_clean_title, format_dmoj_text
+from daisy_cli.platforms import client
+from daisy_cli.platforms.cache import OfflineCacheMiss
+from daisy_cli.profiling import traced
+from daisy_cli.utils import clean_title, extract_clean_title, format_dmoj_text
+
+# overridable so the scraper can run against a local stub server
+BASE_URL = os.environ.get("DAISY_DMOJ_URL", "https://dmoj.ca").rstrip("/")
+PROBLEM_PATH_PATTERN = re.compile(r"^/problem/([^/]+)/?$")
+
+_streaming = False
+
+def use_streaming_parser(enabled: bool = True) -> None:
+    """Parse pages with `parse_problem_stream` instead of a full BeautifulSoup tree."""
+    global _streaming
+    _streaming = enabled
+
+def _page_parser():
+    return parse_problem_stream if _streaming else parse_problem_html
+
+def problem_code(url: str) -> str | None:
+    """The problem code of a /problem/<code> URL, None for any other page."""
+    match = PROBLEM_PATH_PATTERN.match(urlparse(url).path)
+    return match.group(1) if match else None
+
+def _api_problem(payload: str) -> dict | None:
+    try:
+        response = json.loads(payload)
+    except json.JSONDecodeError:
+        return None
+    data = response.get("data") if isinstance(response, dict) else None
+    problem = data.get("object") if isinstance(data, dict) else None
+    if not isinstance(problem, dict) or "name" not in problem:
+        return None
+    return problem
+
+def _fetch_optional(key: str, url: str, validate: Callable[[str], bool]) -> str | None:
+    # a missing API entry or raw view only means falling back to the next source
+    try:
+        return client.fetch_text("dmoj", key, "GET", url, validate=validate)
+    except (requests.HTTPError, OfflineCacheMiss):
+        return None
+
+def fetch_problem(code: str) -> dict | None:
+    """
+    The problem's /api/v2/problem/<code> object (name, points, limits, ...),
+    or None when the API can't serve it, e.g. for private problems.
+    """
+    payload = _fetch_optional(
+        f"api/{code}", f"{BASE_URL}/api/v2/problem/{code}",
+        validate=lambda p: _api_problem(p) is not None,
+    )
+    return _api_problem(payload) if payload is not None else None
+
+def _statement_sources(url: str, code: str | None, problem: dict | None) -> list[tuple[Callable, Callable]]:
+    """
+    (fetch, parse) pairs for the statement, cheapest first: the markdown
+    source when the API object carries it, the bare /problem/<code>/raw
+    view, then the full page. A fetch returning None skips its source.
+    """
+    sources = []
+    if problem is not None and isinstance(problem.get("description"), str):
+        title = clean_title(problem["name"])
+        sources.append((lambda: problem["description"], partial(parse_problem_source, title=title)))
+    if code is not None:
+        raw_url = f"{BASE_URL}/problem/{code}/raw"
+        sources.append((partial(_fetch_optional, f"raw/{code}", raw_url, lambda p: "<h2" in p), _page_parser()))
+        url = f"{BASE_URL}/problem/{code}"
+    sources.append((partial(client.fetch_text, "dmoj", url, "GET", url), _page_parser()))
+    return sources
+
+def _limits_text(problem: dict) -> str | None:
+    time_limit, memory_limit = problem.get("time_limit"), problem.get("memory_limit")
+    if time_limit is None or memory_limit is None:
+        return None
+    # DMOJ stores memory limits in KiB and shows them as "256M"
+    memory = f"{memory_limit // 1024}M" if memory_limit >= 1024 else f"{memory_limit}K"
+    return f"{float(time_limit)}s, {memory}"
+
+def _with_metadata(data: dict, problem: dict | None) -> dict:
+    if problem is not None:
+        data["points"] = problem.get("points")
+        data["limits"] = _limits_text(problem)
+    return data
 
 def extract_problem_parts(url: str) -> dict:
-    response = requests.get(url)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "lxml")
+    code = problem_code(url)
+    problem = fetch_problem(code) if code else None
+    *fallbacks, (fetch, parse) = _statement_sources(url, code, problem)
+    for fetch_fallback, parse_fallback in fallbacks:
+        text = fetch_fallback()
+        if text is not None:
+            try:
+                return _with_metadata(parse_fallback(text), problem)
+            except ValueError:
+                pass  # e.g. a statement without the usual headers
+    return _with_metadata(parse(fetch()), problem)
 
-    title = extract_clean_title(soup)
+async def extract_problem_parts_async(url: str, executor: Executor | None = None) -> dict:
+    """
+    Async `extract_problem_parts`: the API and page fetches overlap with other
+    fetches and parsing runs on `executor` (e.g. a process pool) to keep the
+    loop free.
+    """
+    code = problem_code(url)
+    problem = await asyncio.to_thread(fetch_problem, code) if code else None
+    loop = asyncio.get_running_loop()
+    # resolved here, since a process pool worker doesn't share this module's state
+    *fallbacks, (fetch, parse) = _statement_sources(url, code, problem)
+    for fetch_fallback, parse_fallback in fallbacks:
+        text = await asyncio.to_thread(fetch_fallback)
+        if text is not None:
+            try:
+                return _with_metadata(await loop.run_in_executor(executor, parse_fallback, text), problem)
+            except ValueError:
+                pass
+    text = await asyncio.to_thread(fetch)
+    return _with_metadata(await loop.run_in_executor(executor, parse, text), problem)
 
-    h4_tags = soup.find_all("h4")
+CONSTRAINTS_HEADER = "Constraints"
+INPUT_HEADER = "Input Specification"
+OUTPUT_HEADER = "Output Specification"
+SAMPLE_INPUT_PREFIX = "Sample Input"
+SAMPLE_OUTPUT_PREFIX = "Sample Output"
+SECTION_TAGS = ("h2", "h4", "p", "pre")
+# bs4 types the strings inside these tags as Script/Stylesheet/..., which .text skips
+HIDDEN_STRING_TAGS = ("script", "style", "template", "rt", "rp")
+STREAM_CHUNK_SIZE = 64 * 1024
 
-    constraints_h4 = next((h for h in h4_tags if h.text.strip() == "Constraints"), None)
-    input_h4 = next((h for h in h4_tags if h.text.strip() == "Input Specification"), None)
-    output_h4 = next((h for h in h4_tags if h.text.strip() == "Output Specification"), None)
+# DMOJ statement source (markdown): "## Input Specification" headings,
+# ~...~ math, fenced or indented sample blocks
+MARKDOWN_HEADING_PATTERN = re.compile(r"^ {0,3}#{1,6}\s+(.*?)(?:\s+#+)?\s*$")
+MARKDOWN_FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+MARKDOWN_LIST_ITEM_PATTERN = re.compile(r"^ {0,3}(?:[-*+]|\d+[.)])\s+")
+MARKDOWN_CODE_INDENT = "    "
+# math is kept verbatim for format_dmoj_text, the rest loses its markup
+MARKDOWN_MATH_PATTERN = re.compile(r"(~[^~]*~)")
+MARKDOWN_LINK_PATTERN = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_MARKUP_PATTERN = re.compile(r"\*\*|__|`|<[A-Za-z/!][^>]*>")
+MARKDOWN_ESCAPE_PATTERN = re.compile(r"\\([\\`*_{}\[\]()#+\-.!<>])")
 
-    if not input_h4 or not output_h4:
-        raise ValueError("Could not find all required section headers.")
+@traced("parse", "dmoj")
+def parse_problem_html(html: str) -> dict:
+    """
+    Extract the problem parts from a fully parsed BeautifulSoup tree.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    elements = (
+        (tag.name, id(tag.parent), tag.text.strip(), tag)
+        for tag in soup.find_all(SECTION_TAGS)
+    )
+    return _sort_sections(extract_clean_title(soup), elements)
+
+@traced("parse", "dmoj")
+def parse_problem_stream(html: str, chunk_size: int = STREAM_CHUNK_SIZE) -> dict:
+    """
+    Extract the problem parts without building a document tree: the page is
+    fed in chunks to an lxml target parser that only keeps the text of the
+    headings, paragraphs and <pre> blocks. Returns the same dict as
+    `parse_problem_html` with a fraction of its memory.
+    """
+    from lxml import etree
+
+    target = _SectionTarget()
+    # same parser settings bs4's "lxml" builder uses, so both see the same events
+    parser = etree.HTMLParser(target=target, recover=True)
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        pass  # nothing to parse; reported as the missing <h2> below
+
+    if target.title is None:
+        raise ValueError("No <h2> element found in the HTML content.")
+    return _sort_sections(clean_title(target.title), target.elements)
+
+@traced("parse", "dmoj")
+def parse_problem_source(source: str, title: str) -> dict:
+    """
+    Extract the problem parts from the statement's markdown source, as the
+    API serves it: returns the same dict as `parse_problem_html` without
+    rendering or parsing any HTML.
+    """
+    return _sort_sections(title, _markdown_elements(source))
+
+def _markdown_text(text: str) -> str:
+    """Plain text of a markdown paragraph, like the rendered <p> .text."""
+    parts = MARKDOWN_MATH_PATTERN.split(text)
+    for i in range(0, len(parts), 2):
+        plain = MARKDOWN_LINK_PATTERN.sub(r"\1", parts[i])
+        plain = MARKDOWN_MARKUP_PATTERN.sub("", plain)
+        parts[i] = MARKDOWN_ESCAPE_PATTERN.sub(r"\1", plain)
+    return "".join(parts).strip()
+
+def _markdown_elements(source: str) -> list[tuple]:
+    """
+    (name, parent id, text, key) for every heading (as "h4"), paragraph and
+    code block (as "pre") of a markdown statement, like `_SectionTarget`
+    records them. List items become "- item" paragraphs.
+    """
+    elements = []
+    paragraph: list[str] = []
+    code: list[str] | None = None
+    fence = None  # opening marker of the current fenced block
+
+    def close_paragraph():
+        if paragraph:
+            elements.append(("p", 0, _markdown_text("\n".join(paragraph)), None))
+            paragraph.clear()
+
+    def close_code():
+        nonlocal code
+        if code is not None:
+            elements.append(("pre", 0, "\n".join(code).strip(), None))
+            code = None
+
+    for line in source.splitlines():
+        if fence is not None:
+            if line.strip().startswith(fence) and not line.strip().strip(fence[0]):
+                fence = None
+                close_code()
+            else:
+                code.append(line)
+            continue
+
+        if code is not None:
+            # indented blocks run until the first line that isn't indented
+            if not line.strip() or line.startswith(MARKDOWN_CODE_INDENT):
+                code.append(line[len(MARKDOWN_CODE_INDENT):])
+                continue
+            close_code()
+
+        stripped = line.strip()
+        if not stripped:
+            close_paragraph()
+        elif match := MARKDOWN_FENCE_PATTERN.match(line):
+            close_paragraph()
+            fence, code = match.group(1), []
+        elif match := MARKDOWN_HEADING_PATTERN.match(line):
+            close_paragraph()
+            text = _markdown_text(match.group(1))
+            elements.append(("h4", 0, text, ("h4", text)))
+        elif not paragraph and line.startswith(MARKDOWN_CODE_INDENT):
+            code = [line[len(MARKDOWN_CODE_INDENT):]]
+        elif match := MARKDOWN_LIST_ITEM_PATTERN.match(line):
+            close_paragraph()
+            paragraph.append("- " + line[match.end():])
+        else:
+            paragraph.append(stripped)
 
-    first_h4 = h4_tags[0]
+    close_paragraph()
+    close_code()
+    return elements
 
+class _SectionTarget:
+    """
+    lxml parser target recording (name, parent id, text, key) for every tag in
+    SECTION_TAGS, in document order, and dropping everything else as it streams.
+    `key` compares like bs4 tags do (name, attributes and children), which the
+    section terminators rely on.
+    """
+
+    def __init__(self):
+        self.elements = []
+        self.title = None
+        self._next_id = 1
+        self._stack = [(None, 0)]  # (tag name, element id) of the open elements
+        self._open = []  # [element index, strings, key parts] being filled
+        self._buffer = []
+        self._hidden = 0  # open tags whose strings bs4 leaves out of .text
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        string = "".join(self._buffer)
+        self._buffer = []
+        for _, strings, key in self._open:
+            if not self._hidden:
+                strings.append(string)
+            if key is not None:
+                key.append(string)
+
+    def start(self, tag, attrib):
+        self._flush()
+        for _, _, key in self._open:
+            if key is not None:
+                key.append(("<", tag, tuple(sorted(attrib.items()))))
+
+        if tag in SECTION_TAGS:
+            key = [("<", tag, tuple(sorted(attrib.items())))] if tag == "h4" else None
+            self._open.append((len(self.elements), [], key))
+            self.elements.append(None)
+
+        if tag in HIDDEN_STRING_TAGS:
+            self._hidden += 1
+        self._stack.append((tag, self._next_id))
+        self._next_id += 1
+
+    def end(self, tag):
+        self._flush()
+        name, _ = self._stack.pop()
+        if name in HIDDEN_STRING_TAGS:
+            self._hidden -= 1
+
+        if name in SECTION_TAGS:
+            index, strings, key = self._open.pop()
+            text = "".join(strings)
+            if name == "h2" and self.title is None:
+                self.title = "".join(s.strip() for s in strings)
+            self.elements[index] = (name, self._stack[-1][1], text.strip(), tuple(key) if key is not None else None)
+
+        for _, _, key in self._open:
+            if key is not None:
+                key.append((">",))
+
+    def data(self, data):
+        self._buffer.append(data)
+
+    def comment(self, text):
+        # comments end the current string and count as children, but not as text
+        self._flush()
+        for _, _, key in self._open:
+            if key is not None:
+                key.append(text)
+
+    def close(self):
+        self._flush()
+
+def _sort_sections(title: str, elements) -> dict:
+    """
+    Sort the page into sections in a single forward pass over its headings,
+    paragraphs and <pre> blocks, given as (name, parent id, text, key):
+      - description: <p> after the last <h2> preceding the first <h4>
+      - constraints/input/output: sibling <p> after their <h4>, up to the
+        next spec header (or the first sample header for the output)
+      - samples: the first sibling <pre> after each "Sample ..." <h4>
+    """
+    constraints_h4 = input_h4 = output_h4 = None
+    seen_h4 = False
     description_parts = []
-    for tag in first_h4.find_all_previous():
-        if tag.name == "h2":
-            break
-        if tag.name == "p":
-            description_parts.insert(0, tag.text.strip())
-
-    constraints_parts = []
-    if constraints_h4:
-        for tag in constraints_h4.find_next_siblings():
-            if tag == input_h4:
-                break
-            if tag.name == "p":
-                constraints_parts.append(tag.text.strip())
-
-    input_parts = []
-    for tag in input_h4.find_next_siblings():
-        if tag == output_h4:
-            break
-        if tag.name == "p":
-            input_parts.append(tag.text.strip())
-
-    output_parts = []
-    for tag in output_h4.find_next_siblings():
-        if tag.name == "h4" and tag.text.strip().startswith("Sample Input"):
-            break
-        if tag.name == "p":
-            output_parts.append(tag.text.strip())
-
-    sample_inputs = []
-    for h in h4_tags:
-        if h.text.strip().startswith("Sample Input"):
-            for tag in h.find_next_siblings():
-                if tag.name == "pre":
-                    sample_inputs.append(tag.text.strip())
-                    break
-
-    sample_outputs = []
-    for h in h4_tags:
-        if h.text.strip().startswith("Sample Output"):
-            for tag in h.find_next_siblings():
-                if tag.name == "pre":
-                    sample_outputs.append(tag.text.strip())
-                    break
+    # open sections: [parent, parts, is_end(h4)], collecting sibling <p>
+    sections = []
+    constraints_parts, input_parts, output_parts = [], [], []
+    # pending sample headers: [parent, slot index], resolved by the next sibling <pre>
+    pending_samples = []
+    sample_inputs: list[str | None] = []
+    sample_outputs: list[str | None] = []
+
+    for element in elements:
+        name, parent, text, _ = element
+
+        if name == "p":
+            if not seen_h4:
+                description_parts.append(text)
+            for section_parent, parts, _ in sections:
+                if parent == section_parent:
+                    parts.append(text)
+
+        elif name == "pre":
+            if pending_samples:
+                still_pending = []
+                for sample_parent, samples, slot in pending_samples:
+                    if parent == sample_parent:
+                        samples[slot] = text
+                    else:
+                        still_pending.append((sample_parent, samples, slot))
+                pending_samples = still_pending
+
+        elif name == "h2":
+            # only the paragraphs after the last <h2> belong to the description
+            if not seen_h4:
+                description_parts = []
+
+        else:
+            seen_h4 = True
+
+            if text == INPUT_HEADER and input_h4 is None:
+                input_h4 = element
+            if text == OUTPUT_HEADER and output_h4 is None:
+                output_h4 = element
+
+            sections = [
+                section for section in sections
+                if not (parent == section[0] and section[2](element))
+            ]
+
+            if element is input_h4:
+                sections.append((parent, input_parts, lambda h: output_h4 is not None and h[3] == output_h4[3]))
+            elif element is output_h4:
+                sections.append((parent, output_parts, lambda h: h[2].startswith(SAMPLE_INPUT_PREFIX)))
+            elif text == CONSTRAINTS_HEADER and constraints_h4 is None:
+                constraints_h4 = element
+                sections.append((parent, constraints_parts, lambda h: input_h4 is not None and h[3] == input_h4[3]))
+
+            if text.startswith(SAMPLE_INPUT_PREFIX):
+                pending_samples.append((parent, sample_inputs, len(sample_inputs)))
+                sample_inputs.append(None)
+            if text.startswith(SAMPLE_OUTPUT_PREFIX):
+                pending_samples.append((parent, sample_outputs, len(sample_outputs)))
+                sample_outputs.append(None)
+
+    if not input_h4 or not output_h4:
+        raise ValueError("Could not find all required section headers.")
 
     return {
         "title": title,
@@ -72,9 +420,9 @@ def extract_problem_parts(url: str) -> dict:
         "constraints": "\n\n".join(format_dmoj_text(p) for p in constraints_parts) if constraints_parts else None,
         "input_spec": "\n\n".join(format_dmoj_text(p) for p in input_parts),
         "output_spec": "\n\n".join(format_dmoj_text(p) for p in output_parts),
-        "constraints_header": constraints_h4.text.strip() if constraints_h4 else None,
-        "input_header": input_h4.text.strip(),
-        "output_header": output_h4.text.strip(),
-        "sample_inputs": sample_inputs,
-        "sample_outputs": sample_outputs,
-    }
\ No newline at end of file
+        "constraints_header": constraints_h4[2] if constraints_h4 else None,
+        "input_header": input_h4[2],
+        "output_header": output_h4[2],
+        "sample_inputs": [sample for sample in sample_inputs if sample is not None],
+        "sample_outputs": [sample for sample in sample_outputs if sample is not None],
+    }
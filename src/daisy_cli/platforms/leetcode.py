@@ -1,93 +1,226 @@
+from concurrent.futures import Executor
 from urllib.parse import urlparse
+import asyncio
 import json
+import os
 import re
 
 import requests
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
-from daisy_cli.utils import format_leetcode_text, group_constraints
+from daisy_cli.platforms import client
+from daisy_cli.profiling import traced
+from daisy_cli.utils import format_leetcode_node, group_constraints
 
-GRAPHQL_URL = "https://leetcode.com/graphql"
+# overridable so the scraper can run against a local stub server
+BASE_URL = os.environ.get("DAISY_LEETCODE_URL", "https://leetcode.com").rstrip("/")
+GRAPHQL_URL = f"{BASE_URL}/graphql"
 HEADERS = {
     "User-Agent": "Mozilla/5.0",
     "Content-Type": "application/json",
 }
 
-def extract_problem_parts(url: str) -> dict:
-    def _slug_from_url(url: str) -> str:
-        """
-        Extracts the problem slug from a LeetCode URL.
-        """
-        path_parts = urlparse(url).path.strip("/").split("/")
-        if len(path_parts) >= 2 and path_parts[0] == "problems":
-            return path_parts[1]
-        raise ValueError(f"Invalid LeetCode problem URL: {url}")
-
-    slug = _slug_from_url(url)
-
-    query = """
-    query getQuestionDetail($titleSlug: String!) {
-      question(titleSlug: $titleSlug) {
+QUESTION_FIELDS = """
         title
         content
         codeDefinition
         sampleTestCase
         exampleTestcases
-      }
+"""
+BATCH_SIZE = 20  # questions per aliased GraphQL request
+
+def slug_from_url(url: str) -> str:
+    """
+    Extracts the problem slug from a LeetCode URL.
+    """
+    path_parts = urlparse(url).path.strip("/").split("/")
+    if len(path_parts) >= 2 and path_parts[0] == "problems":
+        return path_parts[1]
+    raise ValueError(f"Invalid LeetCode problem URL: {url}")
+
+def _question_from_payload(payload: str) -> dict | None:
+    try:
+        return (json.loads(payload).get("data") or {}).get("question") or None
+    except (json.JSONDecodeError, AttributeError):
+        return None
+
+def _question_request(slug: str) -> dict:
+    query = f"""
+    query getQuestionDetail($titleSlug: String!) {{
+      question(titleSlug: $titleSlug) {{{QUESTION_FIELDS}      }}
+    }}
+    """
+    return {
+        "validate": lambda p: _question_from_payload(p) is not None,
+        "json": {"query": query, "variables": {"titleSlug": slug}},
+        "headers": HEADERS,
     }
+
+def _require_question(payload: str, slug: str) -> dict:
+    question = _question_from_payload(payload)
+    if not question:
+        raise ValueError(f"Could not retrieve question for slug '{slug}'")
+    return question
+
+def fetch_question(slug: str) -> dict:
+    payload = client.fetch_text("leetcode", slug, "POST", GRAPHQL_URL, **_question_request(slug))
+    return _require_question(payload, slug)
+
+async def fetch_question_async(slug: str) -> dict:
+    payload = await client.fetch_text_async("leetcode", slug, "POST", GRAPHQL_URL, **_question_request(slug))
+    return _require_question(payload, slug)
+
+def _fetch_question_batch(slugs: list[str]) -> dict[str, dict | None]:
     """
-    variables = {"titleSlug": slug}
+    Fetch several questions in one POST by aliasing the `question` field
+    (q0: question(titleSlug: $s0) ...). Missing slugs map to None.
+    """
+    params = ", ".join(f"$s{i}: String!" for i in range(len(slugs)))
+    fields = "".join(
+        f"      q{i}: question(titleSlug: $s{i}) {{{QUESTION_FIELDS}      }}\n"
+        for i in range(len(slugs))
+    )
+    query = f"query getQuestionDetails({params}) {{\n{fields}}}"
+    variables = {f"s{i}": slug for i, slug in enumerate(slugs)}
 
-    response = requests.post(
+    response = client.post(
         GRAPHQL_URL,
         json={"query": query, "variables": variables},
         headers=HEADERS,
     )
     response.raise_for_status()
-    data = response.json()
 
-    question = data.get("data", {}).get("question")
-    if not question:
-        raise ValueError(f"Could not retrieve question for slug '{slug}'")
+    data = response.json().get("data")
+    if not data:
+        raise ValueError("Batched question query returned no data")
+    return {slug: data.get(f"q{i}") for i, slug in enumerate(slugs)}
 
-    title = question["title"]
+def fetch_questions(slugs: list[str], batch_size: int = BATCH_SIZE) -> dict[str, dict | Exception]:
+    """
+    Fetch many questions, `batch_size` per request, skipping those already
+    cached. Each question is cached as if fetched alone, so single and batch
+    pulls share entries. A batch that fails as a whole is retried slug by slug.
+    """
+    questions: dict[str, dict | Exception] = {}
+    missing = []
+    for slug in dict.fromkeys(slugs):
+        payload = client.lookup_cached("leetcode", slug)
+        question = _question_from_payload(payload) if payload else None
+        if question:
+            questions[slug] = question
+        else:
+            missing.append(slug)
+
+    for start in range(0, len(missing), batch_size):
+        chunk = missing[start:start + batch_size]
+
+        batch = None
+        if not client.is_offline():
+            try:
+                batch = _fetch_question_batch(chunk)
+            except (requests.RequestException, ValueError):
+                batch = None
+
+        for slug in chunk:
+            if batch is None:
+                try:
+                    questions[slug] = fetch_question(slug)
+                except Exception as e:
+                    questions[slug] = e
+            elif batch[slug]:
+                questions[slug] = batch[slug]
+                client.store_text("leetcode", slug, json.dumps({"data": {"question": batch[slug]}}))
+            else:
+                questions[slug] = ValueError(f"Could not retrieve question for slug '{slug}'")
 
-    soup = BeautifulSoup(question["content"], "lxml")
-    paragraphs = soup.find_all("p")
+    return questions
 
-    # detect end of description (empty paragraph separator)
-    desc_end_idx = None
-    for i, p in enumerate(paragraphs):
-        if not p.get_text(strip=True):
-            desc_end_idx = i
-            break
+def extract_problem_parts(url: str) -> dict:
+    return parse_question(fetch_question(slug_from_url(url)))
 
-    if desc_end_idx is None:
-        desc_end_idx = len(paragraphs)
+async def extract_problem_parts_async(url: str, executor: Executor | None = None) -> dict:
+    """
+    Async `extract_problem_parts`: the GraphQL request overlaps with other
+    fetches and HTML parsing runs on `executor` (e.g. a process pool).
+    """
+    question = await fetch_question_async(slug_from_url(url))
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, parse_question, question)
+
+def extract_many_problem_parts(urls: list[str]) -> list[dict | Exception]:
+    """Batched `extract_problem_parts`, returning a result or error per URL."""
+    slugs: list[str | Exception] = []
+    for url in urls:
+        try:
+            slugs.append(slug_from_url(url))
+        except ValueError as e:
+            slugs.append(e)
+
+    questions = fetch_questions([slug for slug in slugs if isinstance(slug, str)])
+
+    results: list[dict | Exception] = []
+    for slug in slugs:
+        question = questions[slug] if isinstance(slug, str) else slug
+        if isinstance(question, Exception):
+            results.append(question)
+            continue
+        try:
+            results.append(parse_question(question))
+        except Exception as e:
+            results.append(e)
+    return results
+
+def _is_constraints_header(p: Tag) -> bool:
+    text = p.string
+    return bool(text and text.strip().startswith("Constraints:"))
+
+@traced("parse", "leetcode")
+def parse_question(question: dict) -> dict:
+    """
+    Split the question's HTML into description, constraints and examples
+    in one pass over its <p>, <ul> and <pre> nodes, formatting each node
+    as it is reached.
+    """
+    title = question["title"]
 
-    description_parts = [
-        format_leetcode_text(str(p)) for p in paragraphs[:desc_end_idx]
-    ]
+    soup = BeautifulSoup(question["content"], "lxml")
 
+    description_parts = []
+    description_done = False
     constraints_header = None
+    constraints_p = None
     constraints_parts = []
-
-    constraints_p = soup.find(
-        "p",
-        string=lambda t: bool(t and t.strip().startswith("Constraints:"))
-    )
-
-    if constraints_p:
-        constraints_header = constraints_p.get_text(strip=True).rstrip(":")
-        ul_tag = constraints_p.find_next_sibling("ul")
-        if isinstance(ul_tag, Tag):
-            for li in ul_tag.find_all("li"):
-                constraints_parts.append(format_leetcode_text(str(li)))
+    constraints_done = False
+    sample_inputs, sample_outputs, sample_explanations, varnames, literals = [], [], [], [], []
+
+    for node in soup.find_all(["p", "ul", "pre"]):
+        if node.name == "p":
+            # description ends at the first empty paragraph separator
+            if not description_done:
+                if node.get_text(strip=True):
+                    description_parts.append(format_leetcode_node(node))
+                else:
+                    description_done = True
+            if constraints_p is None and _is_constraints_header(node):
+                constraints_p = node
+                constraints_header = node.get_text(strip=True).rstrip(":")
+        elif node.name == "ul":
+            # the constraints list is the first <ul> sibling after its header
+            if constraints_p is not None and not constraints_done and node.parent is constraints_p.parent:
+                constraints_parts = [format_leetcode_node(li) for li in node.find_all("li")]
+                constraints_done = True
+        else:
+            sample = extract_sample(node)
+            if sample:
+                sample_inputs.append(sample[0])
+                sample_outputs.append(sample[1])
+                sample_explanations.append(sample[2])
+                varnames.append(sample[3])
+                literals.append(sample[4])
 
     constraints_block = group_constraints(constraints_parts) if constraints_parts else None
     rust_signature = extract_rust_signature(question.get("codeDefinition", ""))
-    sample_inputs, sample_outputs, sample_explanations, varnames = extract_samples(soup)
 
     return {
         "title": title,
@@ -98,6 +231,7 @@ def extract_problem_parts(url: str) -> dict:
         "sample_outputs": sample_outputs,
         "sample_explanations": sample_explanations,
         "sample_varnames": varnames,
+        "sample_literals": literals,
         "rust_signature": rust_signature,
     }
 
@@ -127,168 +261,176 @@ def extract_rust_signature(code_definition_json: str) -> str | None:
         return lines[0]
     return None
 
-def extract_samples(soup: BeautifulSoup) -> tuple[list[str], list[str], list[str], list[list[str]]]:
+INPUT_PATTERN = re.compile(r"Input:\s*(.+)")
+OUTPUT_PATTERN = re.compile(r"Output:\s*(.+)")
+EXPLANATION_PATTERN = re.compile(r"Explanation:\s*(.+)")
+
+# LeetCode literal syntax, one token per match. Inside a list, scalars
+# (numbers, true/false, null or anything unrecognized) are read a whole
+# comma-separated span at a time, and so are runs of plain strings, so huge
+# example arrays are converted by a few C-level string operations instead
+# of a Python step per element.
+LITERAL_TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<open>\[)
+      | (?P<close>\])
+      | (?P<comma>,)
+      | (?P<strings>"[^"\\]*"(?:\s*,\s*"[^"\\]*")+)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<scalar>[^\s,\[\]"'][^,\[\]"']*)
+    )
+""", re.VERBOSE)
+SCALAR_SPAN_PATTERN = re.compile(r"""[^\[\]"']*""")
+STRING_RUN_SEPARATOR_PATTERN = re.compile(r'"\s*,\s*"')
+ASSIGNMENT_PATTERN = re.compile(r"\s*([A-Za-z_]\w*)\s*=")
+SEPARATOR_PATTERN = re.compile(r"\s*,")
+TRAILING_SPACE_PATTERN = re.compile(r"\s*")
+BOOLEANS = ("true", "false")
+
+def _rust_string(token: str) -> str:
+    # single-quoted strings become Rust (double-quoted) strings
+    if token[0] == "'":
+        return '"' + token[1:-1].replace('"', '\\"') + '"'
+    return token
+
+def _parse_literal(s: str, pos: int = 0) -> tuple[str, int]:
     """
-    Parse LeetCode <pre> example blocks and produce Rust-ready
-    `sample_inputs` (multi-line let-statements) and `sample_outputs`.
-    This is generic: it discovers `name = value` pairs and maps:
-      - bracketed lists -> `vec![...]` (elements normalized with ", ")
-      - scalars left as-is
+    Parse one literal (number, string, boolean or nested list) starting at
+    `pos` and return (Rust expression, end position). A single pass over the
+    tokens writes the Rust text into one buffer: lists become `vec![...]`,
+    single-quoted strings become double-quoted, a whole boolean literal is
+    lowercased and other scalars (null included) are kept as written.
+    Nesting is tracked on an explicit stack, so depth isn't bounded by
+    recursion. Raises ValueError on malformed input.
     """
-    def _split_top_level_commas(s: str) -> list[str]:
-        parts = []
-        buf = []
-        depth = 0
-        in_quote = None
-        for ch in s:
-            if in_quote:
-                buf.append(ch)
-                if ch == in_quote:
-                    in_quote = None
+    out: list[str] = []
+    # open lists: whether each has an item yet
+    stack: list[bool] = []
+    expect_value = True
+
+    while True:
+        if stack and expect_value:
+            span = SCALAR_SPAN_PATTERN.match(s, pos).group()
+            if span and not span.isspace():
+                parts = span.split(",")
+                # text after the last comma: empty if the span ends on one
+                last = parts.pop().strip()
+                values = [value.strip() for value in parts]
+                if last:
+                    values.append(last)
+                if not all(values):
+                    raise ValueError(f"Empty list item at {pos}")
+
+                if stack[-1]:
+                    out.append(", ")
+                out.append(", ".join(values))
+                stack[-1] = True
+                pos += len(span)
+                expect_value = not last
                 continue
-            if ch in ("'", '"'):
-                in_quote = ch
-                buf.append(ch)
+
+        match = LITERAL_TOKEN_PATTERN.match(s, pos)
+        if match is None:
+            raise ValueError(f"Unexpected end of literal at {pos}")
+        kind = match.lastgroup
+        pos = match.end()
+
+        if kind == "comma":
+            if expect_value or not stack:
+                raise ValueError(f"Unexpected ',' at {match.start(kind)}")
+            expect_value = True
+            continue
+
+        if kind == "close":
+            if not stack:
+                raise ValueError(f"Unexpected ']' at {match.start(kind)}")
+            stack.pop()
+            out.append("]")
+        else:
+            if not expect_value:
+                raise ValueError(f"Expected ',' or ']' at {match.start(kind)}")
+            if stack and stack[-1]:
+                out.append(", ")
+            token = match.group(kind)
+
+            if kind == "open":
+                out.append("vec![")
+                stack.append(False)
                 continue
-            if ch == '[':
-                depth += 1
-            elif ch == ']':
-                depth -= 1
-            if ch == ',' and depth == 0:
-                parts.append("".join(buf).strip())
-                buf = []
-            else:
-                buf.append(ch)
-        if buf:
-            parts.append("".join(buf).strip())
-        return parts
-
-    def _parse_assignments(s: str) -> list[tuple[str, str]]:
-        """
-        Returns list of (name, raw_value) preserving order.
-        Handles values that are bracketed lists (with nested brackets)
-        or simple scalars separated by top-level commas.
-        """
-        i = 0
-        n = len(s)
-        assignments = []
-        while i < n:
-            # skip whitespace
-            while i < n and s[i].isspace():
-                i += 1
-            # name
-            m = re.match(r"[A-Za-z_]\w*", s[i:])
-            if not m:
-                break
-            name = m.group(0)
-            i += m.end()
-            # skip spaces and equals
-            while i < n and s[i].isspace():
-                i += 1
-            if i >= n or s[i] != "=":
-                break
-            i += 1
-            # skip spaces
-            while i < n and s[i].isspace():
-                i += 1
-            # value
-            if i < n and s[i] == "[":
-                start = i
-                depth = 0
-                in_quote = None
-                while i < n:
-                    ch = s[i]
-                    if in_quote:
-                        if ch == in_quote:
-                            in_quote = None
-                    else:
-                        if ch in ('"', "'"):
-                            in_quote = ch
-                        elif ch == "[":
-                            depth += 1
-                        elif ch == "]":
-                            depth -= 1
-                            if depth == 0:
-                                i += 1
-                                break
-                    i += 1
-                raw_value = s[start:i].strip()
+            if kind == "strings":
+                if not stack:
+                    raise ValueError(f"Unexpected ',' in value at {match.start(kind)}")
+                out.append(STRING_RUN_SEPARATOR_PATTERN.sub('", "', token))
+            elif kind == "string":
+                out.append(_rust_string(token))
             else:
-                start = i
-                # scalar until top-level comma
-                while i < n and s[i] != ",":
-                    i += 1
-                raw_value = s[start:i].strip()
-            assignments.append((name, raw_value))
-            # skip comma if present
-            while i < n and s[i].isspace():
-                i += 1
-            if i < n and s[i] == ",":
-                i += 1
-        return assignments
-
-    def _to_rust_value(raw: str) -> str:
-        raw = raw.strip()
-        # list-ish
-        if raw.startswith("[") and raw.endswith("]"):
-            inner = raw[1:-1].strip()
-            if inner == "":
-                return "vec![]"
-            elems = _split_top_level_commas(inner)
-            norm_elems = []
-            for e in elems:
-                e = e.strip()
-                # keep strings as-is, but normalize quotes to double quotes if single quoted
-                if (e.startswith("'") and e.endswith("'")):
-                    e = '"' + e[1:-1].replace('"', '\\"') + '"'
-                norm_elems.append(e)
-            return "vec![" + ", ".join(norm_elems) + "]"
-        # quoted string
-        if (raw.startswith("'") and raw.endswith("'")):
-            return '"' + raw[1:-1].replace('"', '\\"') + '"'
-        # numeric?
-        if re.fullmatch(r"-?\d+(\.\d+)?", raw):
-            return raw
-        # boolean (lowercase)
-        if raw.lower() in ("true", "false"):
-            return raw.lower()
-        # fallback: return as-is (caller may handle)
-        return raw
-
-    sample_inputs: list[str]  = []
-    sample_outputs: list[str]  = []
-    sample_explanations: list[str]  = []
-    sample_varnames: list[list[str]] = []
-
-    for pre in soup.find_all("pre"):
-        text = pre.get_text("\n", strip=True)
-        input_m = re.search(r"Input:\s*(.+)", text)
-        output_m = re.search(r"Output:\s*(.+)", text)
-        explanation_match = re.search(r"Explanation:\s*(.+)", text)
-        if not input_m or not output_m:
-            continue
+                token = token.rstrip()
+                out.append(token.lower() if not stack and token.lower() in BOOLEANS else token)
 
-        input_str = input_m.group(1).strip()
-        output_str = output_m.group(1).strip()
-        explanation_str = explanation_match.group(1).strip() if explanation_match else ""
+        # a value just ended: an item of the enclosing list, or the whole literal
+        if not stack:
+            return "".join(out), pos
+        stack[-1] = True
+        expect_value = False
 
-        assignments = _parse_assignments(input_str)
-        if not assignments:
-            continue
+def _parse_assignments(s: str) -> list[tuple[str, str, str]]:
+    """
+    Returns list of (name, Rust value, raw literal) preserving order, for an
+    example input such as `nums = [2,7,11,15], target = 9`. Stops at the
+    first assignment that doesn't parse.
+    """
+    assignments = []
+    pos = 0
+    while match := ASSIGNMENT_PATTERN.match(s, pos):
+        try:
+            value, pos = _parse_literal(s, match.end())
+        except ValueError:
+            break
+        assignments.append((match.group(1), value, s[match.end():pos].strip()))
+        separator = SEPARATOR_PATTERN.match(s, pos)
+        if separator is None:
+            break
+        pos = separator.end()
+    return assignments
 
-        input_lines = []
-        varnames = []
-        for name, raw_val in assignments:
-            rust_val = _to_rust_value(raw_val)
-            input_lines.append(f"let {name} = {rust_val};")
-            varnames.append(name)
+def _to_rust_value(raw: str) -> str:
+    """Rust expression for a whole literal, or the raw text if it isn't one."""
+    try:
+        value, pos = _parse_literal(raw)
+    except ValueError:
+        return raw.strip()
+    if TRAILING_SPACE_PATTERN.match(raw, pos).end() != len(raw):
+        return raw.strip()
+    return value
+
+def extract_sample(pre: Tag) -> tuple[str, str, str, list[str], dict] | None:
+    """
+    Parse one LeetCode <pre> example block into a Rust-ready
+    (input let-statements, expected output, explanation, variable names,
+    literals), or None if the block isn't an example. `literals` keeps the
+    values as LeetCode wrote them, {"inputs": {name: raw}, "output": raw},
+    for samples too large to inline (see `formatter.externalize_samples`).
+    """
+    text = pre.get_text("\n", strip=True)
+    input_m = INPUT_PATTERN.search(text)
+    output_m = OUTPUT_PATTERN.search(text)
+    if not input_m or not output_m:
+        return None
 
-        sample_inputs.append("\n".join(input_lines))
-        sample_varnames.append(varnames)
+    explanation_m = EXPLANATION_PATTERN.search(text)
+    input_str = input_m.group(1).strip()
+    output_str = output_m.group(1).strip()
+    explanation_str = explanation_m.group(1).strip() if explanation_m else ""
 
-        expected_val = _to_rust_value(output_str)
-        sample_outputs.append(expected_val)
+    assignments = _parse_assignments(input_str)
+    if not assignments:
+        return None
 
-        sample_explanations.append(explanation_str)
+    input_lines = []
+    varnames = []
+    for name, rust_val, _ in assignments:
+        input_lines.append(f"let {name} = {rust_val};")
+        varnames.append(name)
 
-    return sample_inputs, sample_outputs, sample_explanations, sample_varnames
+    literals = {"inputs": {name: raw for name, _, raw in assignments}, "output": output_str}
+    return "\n".join(input_lines), _to_rust_value(output_str), explanation_str, varnames, literals
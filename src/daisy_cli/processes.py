@@ -0,0 +1,139 @@
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# how long to wait for the output reader once the command is gone; a process
+# that left the group may still hold the pipe open
+READER_JOIN_TIMEOUT = 1.0
+
+# commands `run_command` is waiting on, from any thread
+_running: set[subprocess.Popen] = set()
+_running_lock = threading.Lock()
+
+@dataclass
+class CommandResult:
+    """A finished (or killed) command: exit code, merged output and when each line arrived."""
+    returncode: int
+    stdout: str
+    # seconds since the command started, one per output line
+    line_times: list[float] = field(default_factory=list)
+    timed_out: bool = False
+
+def _popen_options() -> dict:
+    if os.name == "nt":
+        # taskkill /T finds the children through the process tree
+        return {}
+    # its own group, so a kill reaches cargo, rustc and the test binaries alike
+    return {"process_group": 0}
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    """Kill a command started by `run_command` and everything it spawned."""
+    if os.name == "nt":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass  # already gone
+
+def kill_running_commands() -> None:
+    """
+    Kill every command still running under `run_command`, e.g. those of worker
+    threads on Ctrl-C: their process groups don't get the terminal's signal.
+    """
+    with _running_lock:
+        processes = list(_running)
+    for process in processes:
+        kill_process_group(process)
+
+def _read_lines(stream, lines: queue.Queue) -> None:
+    for line in stream:
+        lines.put((time.monotonic(), line))
+    lines.put(None)
+
+def run_command(
+    cmd: list[str],
+    cwd: Path,
+    env: dict[str, str] | None = None,
+    deadline: float | None = None,
+    watch: Callable[[float, str], float | None] | None = None,
+) -> CommandResult:
+    """
+    Run `cmd` with stderr merged into stdout, killing its whole process group
+    once `deadline` (a `time.monotonic()` value) passes. `watch` sees every
+    output line with its arrival time and returns a further deadline, or None
+    for no limit, e.g. to bound how long a single test may run.
+    """
+    started = time.monotonic()
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        # a background process group reading the terminal is stopped by SIGTTIN
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        **_popen_options(),
+    )
+    with _running_lock:
+        _running.add(process)
+    lines: queue.Queue = queue.Queue()
+    reader = threading.Thread(target=_read_lines, args=(process.stdout, lines), daemon=True)
+    reader.start()
+
+    output, line_times = [], []
+    watch_deadline = None
+    timed_out = False
+    try:
+        while True:
+            deadlines = [d for d in (deadline, watch_deadline) if d is not None]
+            timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+            try:
+                item = lines.get(timeout=timeout)
+            except queue.Empty:
+                timed_out = True
+                break
+            if item is None:
+                break
+            at, line = item
+            output.append(line)
+            line_times.append(at - started)
+            if watch is not None:
+                watch_deadline = watch(at, line)
+    except BaseException:
+        # the group doesn't get the terminal's Ctrl-C, so don't leave it running
+        kill_process_group(process)
+        process.wait()
+        raise
+    finally:
+        with _running_lock:
+            _running.discard(process)
+
+    if timed_out:
+        kill_process_group(process)
+        reader.join(READER_JOIN_TIMEOUT)
+        # keep what was printed up to the kill
+        while True:
+            try:
+                item = lines.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                output.append(item[1])
+                line_times.append(item[0] - started)
+
+    returncode = process.wait()
+    if not reader.is_alive():
+        process.stdout.close()
+    return CommandResult(returncode, "".join(output), line_times, timed_out)
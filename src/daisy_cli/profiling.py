@@ -0,0 +1,160 @@
+import functools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Lightweight spans for `--profile`. Recording is off by default, and then
+# `span` hands back a shared no-op, so instrumented code pays one flag check.
+
+@dataclass
+class SpanEvent:
+    name: str
+    category: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    args: dict = field(default_factory=dict)
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+_enabled = False
+_origin_ns = 0
+_events: list[SpanEvent] = []
+_thread_names: dict[int, str] = {}
+_lock = threading.Lock()
+
+class Span:
+    """Times a `with` block and records it when profiling is enabled."""
+
+    __slots__ = ("name", "category", "args", "_start_ns")
+
+    def __init__(self, name: str, category: str, args: dict):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def set(self, **args) -> None:
+        """Attach details known only inside the block, e.g. a status code."""
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        thread = threading.current_thread()
+        event = SpanEvent(
+            name=self.name,
+            category=self.category,
+            start_ns=self._start_ns - _origin_ns,
+            duration_ns=end_ns - self._start_ns,
+            thread_id=thread.ident,
+            args=self.args,
+        )
+        with _lock:
+            _events.append(event)
+            _thread_names.setdefault(thread.ident, thread.name)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **args) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+def span(name: str, category: str = "daisy", **args) -> Span | _NullSpan:
+    """
+    Time a stage, e.g. `with span("render", source="dmoj"): ...`. Spans with
+    the same name are grouped in the summary; `args` end up in the trace.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+def traced(name: str, category: str = "daisy"):
+    """Decorator recording every call of the function as a `name` span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def enable() -> None:
+    """Start recording spans, discarding any recorded before."""
+    global _enabled, _origin_ns
+    with _lock:
+        _events.clear()
+        _thread_names.clear()
+        _origin_ns = time.perf_counter_ns()
+        _enabled = True
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+def events() -> list[SpanEvent]:
+    with _lock:
+        return list(_events)
+
+def summarize() -> dict[str, StageStats]:
+    """Aggregate the recorded spans by name, slowest total first."""
+    stats: dict[str, StageStats] = {}
+    for event in events():
+        stage = stats.setdefault(event.name, StageStats())
+        stage.calls += 1
+        stage.total_ns += event.duration_ns
+        stage.max_ns = max(stage.max_ns, event.duration_ns)
+    return dict(sorted(stats.items(), key=lambda item: item[1].total_ns, reverse=True))
+
+def write_trace(path: Path, metadata: dict | None = None) -> None:
+    """
+    Write the recorded spans in Chrome's trace-event format, viewable in
+    chrome://tracing or Perfetto, as complete ("X") events in microseconds.
+    """
+    pid = os.getpid()
+    with _lock:
+        recorded = list(_events)
+        thread_names = dict(_thread_names)
+
+    trace_events = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+        for tid, name in thread_names.items()
+    ]
+    trace_events.extend(
+        {
+            "name": event.name,
+            "cat": event.category,
+            "ph": "X",
+            "ts": event.start_ns / 1000,
+            "dur": event.duration_ns / 1000,
+            "pid": pid,
+            "tid": event.thread_id,
+            "args": event.args,
+        }
+        for event in recorded
+    )
+
+    trace = {"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": metadata or {}}
+    path.write_text(json.dumps(trace, default=str) + "\n", encoding="utf-8")
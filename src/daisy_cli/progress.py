@@ -0,0 +1,178 @@
+import json
+import sqlite3
+import time
+from collections.abc import Iterable
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    fingerprint TEXT,
+    checked_at REAL NOT NULL,
+    duration REAL,
+    timed_out INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_project ON runs (project, id);
+CREATE TABLE IF NOT EXISTS test_results (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    passed INTEGER NOT NULL,
+    duration REAL,
+    timed_out INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS test_results_by_run ON test_results (run_id);
+"""
+# columns added since the first schema, for databases created before them
+ADDED_COLUMNS = {
+    "runs": {"timed_out": "INTEGER NOT NULL DEFAULT 0"},
+    "test_results": {"timed_out": "INTEGER NOT NULL DEFAULT 0"},
+}
+HISTORY_LIMIT = 50  # runs kept per project
+BUSY_TIMEOUT = 30.0  # seconds to wait for another writer's lock
+
+@dataclass
+class CheckRecord:
+    """One checked project: its result, inputs fingerprint, duration and tests."""
+    project: str
+    passed: bool
+    fingerprint: str | None = None
+    duration: float | None = None
+    # (name, passed), (name, passed, duration) or (name, passed, duration, timed_out)
+    tests: list[tuple] = field(default_factory=list)
+    timed_out: bool = False  # killed on the crate or a test running out of time
+
+@dataclass
+class FailingProject:
+    project: str
+    since: float  # time of the first failing run after the last pass
+    runs: int  # failing runs since then
+    timed_out: bool = False  # whether the last of them timed out
+
+def test_fields(test: tuple) -> tuple[str, bool, float | None, bool]:
+    """(name, passed, duration, timed_out) of a test result in any of CheckRecord's forms."""
+    name, passed, *rest = test
+    duration = rest[0] if rest else None
+    timed_out = bool(rest[1]) if len(rest) > 1 else False
+    return name, passed, duration, timed_out
+
+class ProgressStore:
+    """
+    Check history in an SQLite database: every run of every project with its
+    per-test results. WAL mode and a busy timeout let concurrent `daisy check`
+    processes (CI shards, editor hooks) write without corrupting each other.
+    """
+
+    def __init__(self, path: Path, legacy_file: Path | None = None):
+        self.path = path
+        self.legacy_file = legacy_file
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        with conn:
+            conn.executescript(SCHEMA)
+            self._add_columns(conn)
+            self._import_legacy(conn)
+        return conn
+
+    def _add_columns(self, conn: sqlite3.Connection) -> None:
+        """Bring tables created by earlier versions up to the current SCHEMA."""
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for name, definition in columns.items():
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        """Seed an empty database from the JSON file earlier versions wrote."""
+        if self.legacy_file is None or not self.legacy_file.exists():
+            return
+        if conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone():
+            return
+
+        try:
+            progress = json.loads(self.legacy_file.read_text(encoding="utf-8"))
+            checked_at = self.legacy_file.stat().st_mtime
+        except (json.JSONDecodeError, OSError):
+            return
+
+        # the oldest files stored a bare boolean per project
+        conn.executemany(
+            "INSERT INTO runs (project, passed, fingerprint, checked_at) VALUES (?, ?, ?, ?)",
+            [
+                (name, bool(entry.get("passed")), entry.get("fingerprint"), checked_at)
+                if isinstance(entry, dict) else (name, bool(entry), None, checked_at)
+                for name, entry in progress.items()
+            ],
+        )
+
+    def latest(self) -> dict[str, tuple[bool, str | None]]:
+        """Return {project: (passed, fingerprint)} from each project's last run."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT project, passed, fingerprint FROM runs"
+                " WHERE id IN (SELECT MAX(id) FROM runs GROUP BY project)"
+            ).fetchall()
+        return {project: (bool(passed), fingerprint) for project, passed, fingerprint in rows}
+
+    def record(self, records: Iterable[CheckRecord], checked_at: float | None = None) -> None:
+        """Append one run per record, in a single transaction."""
+        checked_at = time.time() if checked_at is None else checked_at
+        with closing(self._connect()) as conn, conn:
+            for record in records:
+                run_id = conn.execute(
+                    "INSERT INTO runs (project, passed, fingerprint, checked_at, duration, timed_out)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (record.project, record.passed, record.fingerprint, checked_at, record.duration, record.timed_out),
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO test_results (run_id, name, passed, duration, timed_out) VALUES (?, ?, ?, ?, ?)",
+                    [(run_id, *test_fields(test)) for test in record.tests],
+                )
+                conn.execute(
+                    "DELETE FROM runs WHERE project = ? AND id <= ("
+                    " SELECT id FROM runs WHERE project = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (record.project, record.project, HISTORY_LIMIT),
+                )
+
+    def failing_since(self) -> list[FailingProject]:
+        """Projects whose last run failed, longest failing first."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT f.project, f.since, f.runs, l.timed_out FROM ("
+                "  SELECT r.project, MIN(r.checked_at) AS since, COUNT(*) AS runs, MAX(r.id) AS last_id"
+                "  FROM runs r WHERE r.id > COALESCE("
+                "   (SELECT MAX(p.id) FROM runs p WHERE p.project = r.project AND p.passed), 0)"
+                "  GROUP BY r.project"
+                " ) f JOIN runs l ON l.id = f.last_id ORDER BY f.since"
+            ).fetchall()
+        return [
+            FailingProject(project, since, runs, bool(timed_out))
+            for project, since, runs, timed_out in rows
+        ]
+
+    def failing_tests(self, project: str) -> list[tuple[str, bool]]:
+        """(name, timed out) of the tests that failed in the project's last run."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT name, timed_out FROM test_results WHERE NOT passed AND run_id ="
+                " (SELECT MAX(id) FROM runs WHERE project = ?)",
+                (project,),
+            ).fetchall()
+        return [(name, bool(timed_out)) for name, timed_out in rows]
+
+    def slowest(self, limit: int = 5) -> list[tuple[str, float]]:
+        """(project, duration in seconds) of the slowest last runs."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT project, duration FROM runs"
+                " WHERE id IN (SELECT MAX(id) FROM runs WHERE duration IS NOT NULL GROUP BY project)"
+                " ORDER BY duration DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
@@ -2,82 +2,152 @@ import re
 import textwrap
 
 from bs4 import BeautifulSoup
-from bs4.element import NavigableString
+from bs4.element import CData, NavigableString, PageElement, Tag
 
 MAX_WIDTH = 84
 
+# LaTeX commands DMOJ uses inside ~...~ math blocks
+DMOJ_LATEX = {
+    r"\le": "<=",
+    r"\ne": "!=",
+    r"\times": "×",
+    r"\dots": "…",
+    r"\,": " ",
+}
+DMOJ_LATEX_PATTERN = re.compile("|".join(re.escape(cmd) for cmd in DMOJ_LATEX))
+DMOJ_TILDE_PATTERN = re.compile(r"~(.*?)~")
+DMOJ_IDENT_PATTERN = re.compile(r"(?<!\w)([A-Za-z]\w*)(?!\w)")
+
+# Codeforces writes math as $$$...$$$ (inline) or $$$$$$...$$$$$$ (display).
+# Its commands are mapped onto DMOJ's, so both share the ~...~ handling;
+# unknown ones (\max) lose the backslash, known DMOJ ones pass through.
+CODEFORCES_LATEX = {
+    r"\leq": r"\le",
+    r"\geq": ">=",
+    r"\ge": ">=",
+    r"\neq": r"\ne",
+    r"\lt": "<",
+    r"\gt": ">",
+    r"\cdot": "·",
+    r"\ldots": r"\dots",
+    r"\cdots": r"\dots",
+    r"\sum": "Σ",
+    r"\oplus": "⊕",
+    r"\bmod": "mod",
+    r"\lfloor": "⌊",
+    r"\rfloor": "⌋",
+    r"\lceil": "⌈",
+    r"\rceil": "⌉",
+    r"\left": "",
+    r"\right": "",
+    r"\{": "{",
+    r"\}": "}",
+}
+CODEFORCES_COMMAND_PATTERN = re.compile(r"\\(?:[A-Za-z]+|[{}])")
+CODEFORCES_MATH_PATTERN = re.compile(r"\$\$\$(?:\$\$\$)?(.*?)\$\$\$(?:\$\$\$)?")
+# a_{i} -> a_i, 2^{30} -> 2^30
+CODEFORCES_GROUP_PATTERN = re.compile(r"([_^])\{(\w+)\}")
+
+LEETCODE_IDENT_PATTERN = re.compile(r"""
+    (?<!\w)                                     # no word char before
+    ([A-Za-z]\w*(?:\[[^\]]+\]|\.[A-Za-z]\w*)*)  # base identifier
+    (\^[A-Za-z]\w*)?                            # optional exponent
+    (?!\w)                                      # no word char after
+""", re.VERBOSE)
+# ≤/≥ always stand alone, everything else splits on whitespace
+LEETCODE_TOKEN_PATTERN = re.compile(r"[≤≥]|[^\s≤≥]+")
+TEXT_TYPES = (NavigableString, CData)
+
+def _replace_tilde_block(match: re.Match) -> str:
+    content = DMOJ_LATEX_PATTERN.sub(lambda m: DMOJ_LATEX[m.group(0)], match.group(1))
+    return DMOJ_IDENT_PATTERN.sub(r"`\1`", content)
+
 def format_dmoj_text(text: str, max_width: int = MAX_WIDTH) -> str:
-    def _replace_tilde_block(match: re.Match) -> str:
-        content = match.group(1)
-        content = content.replace(r"\le", "<=").replace(r"\,", " ")
-        content = content.replace(r"\ne", "!=").replace(r"\,", " ")
-        content = content.replace(r"\times", "×").replace(r"\,", " ")
-        content = content.replace(r"\dots", "…")
-        content = re.sub(r'(?<!\w)([A-Za-z]\w*)(?!\w)', r'`\1`', content)
-        return content
-    
     processed_lines = []
 
     for raw_line in text.splitlines():
-        transformed = re.sub(r"~(.*?)~", _replace_tilde_block, raw_line.strip())
+        transformed = DMOJ_TILDE_PATTERN.sub(_replace_tilde_block, raw_line.strip())
         wrapped = textwrap.fill(transformed, width=max_width) if transformed else ""
         processed_lines.append(wrapped)
 
     return "\n".join(processed_lines)
 
-def format_leetcode_text(html: str, max_width: int = MAX_WIDTH) -> str:
+def _replace_codeforces_command(match: re.Match) -> str:
+    command = match.group(0)
+    if command in CODEFORCES_LATEX:
+        return CODEFORCES_LATEX[command]
+    return command if command in DMOJ_LATEX else command[1:]
+
+def _replace_codeforces_math(match: re.Match) -> str:
+    content = CODEFORCES_COMMAND_PATTERN.sub(_replace_codeforces_command, match.group(1))
+    return "~" + CODEFORCES_GROUP_PATTERN.sub(r"\1\2", content) + "~"
+
+def format_codeforces_text(text: str, max_width: int = MAX_WIDTH) -> str:
     """
-    Format small HTML snippets coming from LeetCode:
+    Format a Codeforces statement paragraph: collapse its whitespace, turn
+    $$$...$$$ math into DMOJ's ~...~ blocks and format it like DMOJ text.
+    """
+    text = CODEFORCES_MATH_PATTERN.sub(_replace_codeforces_math, " ".join(text.split()))
+    return format_dmoj_text(text, max_width)
+
+def _wrap_identifier(match: re.Match) -> str:
+    # only wrap the base in backticks, leave exponent raw
+    return f"`{match.group(1)}`{match.group(2) or ''}"
+
+def _code_text(node: Tag) -> str:
+    """Text of a <code> subtree, with <sup>n</sup> rendered as ^n."""
+    parts = []
+    for child in node.children:
+        if isinstance(child, Tag):
+            if child.name == "sup":
+                parts.append(f"^{child.get_text(strip=True)}")
+            else:
+                parts.append(_code_text(child))
+        elif type(child) in TEXT_TYPES:
+            parts.append(child)
+    return "".join(parts)
+
+def _process_code_content(s: str) -> str:
+    # collapse whitespace, then glue exponents: "10 ^ 9" -> "10^9"
+    s = " ".join(s.split()).replace(" ^", "^").replace("^ ", "^")
+    return LEETCODE_IDENT_PATTERN.sub(_wrap_identifier, s)
+
+def _leetcode_text_parts(node: PageElement, parts: list[str]) -> None:
+    if isinstance(node, Tag):
+        if node.name == "sup":
+            parts.append(f"^{node.get_text(strip=True)}")
+        elif node.name == "code":
+            parts.append(_process_code_content(_code_text(node)))
+        else:
+            for child in node.children:
+                _leetcode_text_parts(child, parts)
+    elif type(node) in TEXT_TYPES:
+        parts.append(node)
+
+def format_leetcode_node(node: Tag, max_width: int = MAX_WIDTH) -> str:
+    """
+    Format an already-parsed LeetCode fragment (e.g. a <p> or <li> node)
+    without modifying the tree:
     - convert <sup>n</sup> -> ^n (without spaces)
-    - replace <=, &lt;=, >=, &gt;= -> ≤ / ≥ and ensure spaces around them
     - for <code>...</code> content, wrap only identifier-like tokens
       (allowing dotted identifiers, e.g. nums.length) in backticks
+    - ensure single spaces around ≤ / ≥, glue ^ to what precedes it
     - normalize whitespace and line-wrap to max_width
     """
-    soup = BeautifulSoup(html, "lxml")
-
-    # 1) Convert <sup>n</sup> -> ^n (as NavigableString)
-    for sup in soup.find_all("sup"):
-        sup.replace_with(NavigableString(f"^{sup.get_text(strip=True)}"))
-
-    def _process_code_content(s: str) -> str:
-        s = re.sub(r"\s*\^\s*", "^", s)
-
-        ident_pattern = re.compile(r"""
-            (?<!\w)                                     # no word char before
-            ([A-Za-z]\w*(?:\[[^\]]+\]|\.[A-Za-z]\w*)*)  # base identifier
-            (\^[A-Za-z]\w*)?                            # optional exponent
-            (?!\w)                                      # no word char after
-        """, re.VERBOSE)
-
-        # only wrap the base in backticks, leave exponent raw
-        s = ident_pattern.sub(lambda m: f"`{m.group(1)}`{m.group(2) or ''}", s)
-
-        return re.sub(r"\s+", " ", s).strip()
+    parts: list[str] = []
+    _leetcode_text_parts(node, parts)
 
-    for code_tag in soup.find_all("code"):
-        processed = _process_code_content(code_tag.get_text())
-        code_tag.replace_with(NavigableString(processed))
+    tokens = LEETCODE_TOKEN_PATTERN.findall("".join(parts))
+    text = " ".join(tokens).replace(" ^", "^")
 
-    text = soup.get_text()
+    return textwrap.fill(text, width=max_width) if text else ""
 
-    # ensure spaces around ≤/≥ globally (just in case)
-    text = re.sub(r"\s*≤\s*", " ≤ ", text)
-    text = re.sub(r"\s*≥\s*", " ≥ ", text)
-
-    # remove stray spaces before ^ and normalize spaces
-    text = re.sub(r"\s+\^", "^", text)
-    text = re.sub(r"\s+", " ", text).strip()
-
-    processed_lines = []
-    for raw_line in text.splitlines():
-        if raw_line.strip():
-            wrapped = textwrap.fill(raw_line.strip(), width=max_width)
-        else:
-            wrapped = ""
-        processed_lines.append(wrapped)
-
-    return "\n".join(processed_lines)
+def format_leetcode_text(html: str, max_width: int = MAX_WIDTH) -> str:
+    """
+    Format small HTML snippets coming from LeetCode, see `format_leetcode_node`.
+    Prefer that one when the snippet is already part of a parsed document.
+    """
+    return format_leetcode_node(BeautifulSoup(html, "lxml"), max_width)
 
 def is_math_constraint(line: str) -> bool:
     """Return True if the constraint looks like a mathematical expression."""
@@ -118,7 +188,10 @@ def extract_clean_title(soup: BeautifulSoup) -> str:
     if h2_tag is None:
         raise ValueError("No <h2> element found in the HTML content.")
 
-    raw_title = h2_tag.get_text(strip=True)
+    return clean_title(h2_tag.get_text(strip=True))
+
+def clean_title(raw_title: str) -> str:
+    """Drop the contest prefix of a DMOJ title, e.g. "CCC '22 J1 - Cupcake Party"."""
     if " - " in raw_title:
         return raw_title.split(" - ", maxsplit=1)[-1].strip()
     return raw_title
@@ -0,0 +1,67 @@
+import re
+import tomllib
+from collections.abc import Iterable
+from pathlib import Path
+
+WORKSPACE_TEMPLATE = """\
+# managed by daisy: `daisy pull` and `daisy check --workspace` add members here
+[workspace]
+resolver = "3"
+members = []
+"""
+MEMBERS_PATTERN = re.compile(r"^members\s*=\s*\[[^\]]*\]", re.M)
+WORKSPACE_TABLE_PATTERN = re.compile(r"^\[workspace\][^\n]*\n", re.M)
+
+def read_members(exercises_dir: Path) -> list[str] | None:
+    """Return the workspace members, or None if `exercises_dir` is not a workspace."""
+    manifest = exercises_dir / "Cargo.toml"
+    if not manifest.exists():
+        return None
+
+    data = tomllib.loads(manifest.read_text(encoding="utf-8"))
+    workspace = data.get("workspace")
+    if workspace is None:
+        return None
+    return list(workspace.get("members", []))
+
+def member_path(project_dir: Path, exercises_dir: Path) -> str:
+    return project_dir.relative_to(exercises_dir).as_posix()
+
+def sync_workspace(exercises_dir: Path, members: Iterable[str]) -> list[str]:
+    """
+    Create the exercises workspace if needed and make sure it lists `members`.
+    Only the `members` array is rewritten, so any other manual edits to the
+    manifest (profiles, lints, ...) are preserved. Returns the added members.
+    """
+    manifest = exercises_dir / "Cargo.toml"
+    current = read_members(exercises_dir)
+    if current is None and manifest.exists():
+        raise ValueError(f"'{manifest}' exists but has no [workspace] table")
+
+    current = current or []
+    added = [m for m in dict.fromkeys(members) if m not in current]
+    if manifest.exists() and not added:
+        return []
+
+    content = manifest.read_text(encoding="utf-8") if manifest.exists() else WORKSPACE_TEMPLATE
+    members_toml = "members = [\n" + "".join(f'    "{m}",\n' for m in current + added) + "]"
+
+    if MEMBERS_PATTERN.search(content):
+        content = MEMBERS_PATTERN.sub(lambda _: members_toml, content, count=1)
+    else:
+        content = WORKSPACE_TABLE_PATTERN.sub(lambda m: m.group(0) + members_toml + "\n", content, count=1)
+
+    exercises_dir.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(content, encoding="utf-8")
+    return added
+
+def add_workspace_member(exercises_dir: Path, project_name: str) -> bool:
+    """Register a freshly written project, but only if the exercises workspace exists."""
+    if read_members(exercises_dir) is None:
+        return False
+    return bool(sync_workspace(exercises_dir, [project_name]))
+
+def package_name(manifest: Path) -> str:
+    """Return the cargo package name declared in `manifest`, defaulting to its directory."""
+    data = tomllib.loads(manifest.read_text(encoding="utf-8"))
+    return data.get("package", {}).get("name", manifest.parent.name)
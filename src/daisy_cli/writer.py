@@ -1,16 +1,126 @@
+import hashlib
+import json
+import os
+import secrets
+import shutil
 from pathlib import Path
-from rich_click import echo
 
-def write_rust_project(project_name: str, files: dict[str, str], base_dir: Path) -> None:
+from daisy_cli.profiling import traced
+
+# hashes of the files daisy last generated, to tell stale output from user edits
+GENERATED_MANIFEST = ".daisy_generated.json"
+
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+KEPT = "kept"  # edited since daisy generated it, left alone
+# differs from the generated content, but the manifest has no record of it,
+# e.g. in a project generated before manifests existed
+KEPT_NO_MANIFEST = "kept (no manifest)"
+REMOVED = "removed"  # generated before, no longer part of the project
+
+def _digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def _read_text(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8")
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+
+def write_atomic(path: Path, content: str) -> None:
+    """
+    Write `content` to a sibling temp file and rename it over `path`, so an
+    interrupted write never leaves a truncated file behind.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    try:
+        # exclusive create keeps the umask-based mode a plain write_text would get
+        with open(tmp_path, "x", encoding="utf-8") as f:
+            f.write(content)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def _load_manifest(root_dir: Path) -> dict[str, str]:
+    try:
+        return json.loads((root_dir / GENERATED_MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def _remove_empty_dirs(directory: Path, root_dir: Path) -> None:
+    """Remove `directory` and its parents up to `root_dir` while they're empty."""
+    while directory != root_dir and directory.is_relative_to(root_dir):
+        try:
+            directory.rmdir()
+        except OSError:
+            return  # not empty
+        directory = directory.parent
+
+@traced("write", "writer")
+def write_rust_project(
+    project_name: str,
+    files: dict[str, str],
+    base_dir: Path,
+    force: bool = False,
+) -> dict[str, str]:
     """
     Create a Rust project directory with the given files.
     `files` is a dict mapping file paths (relative to the project root) to their contents.
     Works for both Leetcode (lib.rs) and DMOJ (main.rs + cli.rs) structures.
+
+    Files whose content is already up to date are not touched, keeping their
+    mtimes (and cargo's fingerprints) intact. Files edited since daisy wrote
+    them, such as a solution in progress, are kept unless `force` is set.
+    Files daisy generated on an earlier run but no longer produces, e.g. the
+    data files of samples that are now inlined, are removed unless edited.
+    Returns the status of each file: created, updated, unchanged, kept,
+    kept (no manifest) or removed.
     """
     root_dir = base_dir / project_name
     root_dir.mkdir(parents=True, exist_ok=True)
 
+    generated = _load_manifest(root_dir)
+    statuses = {}
+
     for rel_path, content in files.items():
         file_path = root_dir / rel_path
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(content.strip() + "\n", encoding="utf-8")
+        content = content.strip() + "\n"
+        digest = _digest(content)
+        current = _read_text(file_path)
+
+        if current is None and not file_path.exists():
+            status = CREATED
+        elif current == content:
+            status = UNCHANGED
+        elif force or (current is not None and generated.get(rel_path) == _digest(current)):
+            status = UPDATED
+        else:
+            statuses[rel_path] = KEPT if rel_path in generated else KEPT_NO_MANIFEST
+            continue
+
+        if status != UNCHANGED:
+            write_atomic(file_path, content)
+        generated[rel_path] = digest
+        statuses[rel_path] = status
+
+    for rel_path in sorted(set(generated) - set(files)):
+        file_path = root_dir / rel_path
+        current = _read_text(file_path)
+        if current is not None and not force and generated[rel_path] != _digest(current):
+            statuses[rel_path] = KEPT
+            continue
+        if file_path.exists():
+            file_path.unlink()
+            statuses[rel_path] = REMOVED
+            _remove_empty_dirs(file_path.parent, root_dir)
+        del generated[rel_path]
+
+    if generated != _load_manifest(root_dir):
+        write_atomic(root_dir / GENERATED_MANIFEST, json.dumps(generated, indent=2, sort_keys=True) + "\n")
+
+    return statuses
@@ -0,0 +1,90 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from daisy_cli.platforms import client
+from daisy_cli.platforms.cache import ResponseCache
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Sat, 01 Jun 2025 12:00:00 GMT"
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next (status, body, delay) of `responses`, recording it."""
+    responses: list[tuple[int, str, float]] = []
+    requests: list[tuple[str, dict[str, str]]] = []
+
+    def _respond(self):
+        self.requests.append((self.command, dict(self.headers)))
+        status, body, delay = self.responses.pop(0) if self.responses else (200, "ok", 0.0)
+        time.sleep(delay)
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        if status == 200:
+            self.send_header("ETag", ETAG)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    """A local HTTP server and a client with a fresh session and an always-stale cache."""
+    monkeypatch.setattr(StubHandler, "responses", [])
+    monkeypatch.setattr(StubHandler, "requests", [])
+    # configure() rewrites the client's module state, restored after the test
+    for name in ("_timeout", "_retries", "_session", "_cache"):
+        monkeypatch.setattr(client, name, getattr(client, name))
+    client.configure(1.0, 1.0, 1, ResponseCache(tmp_path, ttl=0))
+    monkeypatch.setattr(client, "_session", None)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+def test_stale_entry_is_revalidated(stub):
+    StubHandler.responses = [(200, "statement", 0.0), (304, "", 0.0)]
+    assert client.fetch_text("test", "key", "GET", stub) == "statement"
+    assert client.fetch_text("test", "key", "GET", stub) == "statement"
+
+    (_, first), (_, second) = StubHandler.requests
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"] == ETAG
+    assert second["If-Modified-Since"] == LAST_MODIFIED
+
+def test_fresh_entry_is_served_without_a_request(stub):
+    client._cache.ttl = 60
+    StubHandler.responses = [(200, "statement", 0.0)]
+    client.fetch_text("test", "key", "GET", stub)
+    assert client.fetch_text("test", "key", "GET", stub) == "statement"
+    assert len(StubHandler.requests) == 1
+
+def test_server_errors_are_retried_on_post(stub):
+    StubHandler.responses = [(503, "busy", 0.0), (200, '{"data": {}}', 0.0)]
+    assert client.fetch_text("test", "key", "POST", stub, json={}) == '{"data": {}}'
+    assert [method for method, _ in StubHandler.requests] == ["POST", "POST"]
+
+def test_invalid_bodies_are_not_cached(stub):
+    client._cache.ttl = 60
+    StubHandler.responses = [(200, "captcha", 0.0), (200, "statement", 0.0)]
+    assert client.fetch_text("test", "key", "GET", stub, validate=lambda body: body != "captcha") == "captcha"
+    assert client.fetch_text("test", "key", "GET", stub) == "statement"
+    assert len(StubHandler.requests) == 2
+
+def test_read_timeout_is_configurable(stub):
+    client.configure(read_timeout=0.2, retries=0)
+    StubHandler.responses = [(200, "slow", 1.0)]
+    started = time.monotonic()
+    with pytest.raises(requests.RequestException):
+        client.fetch_text("test", "key", "GET", stub)
+    assert time.monotonic() - started < 1.0
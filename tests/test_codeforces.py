@@ -0,0 +1,124 @@
+import json
+from pathlib import Path
+
+import pytest
+import requests
+
+from daisy_cli.platforms import client, codeforces
+from daisy_cli.platforms.codeforces import (
+    PROBLEMSET_KEY,
+    _index_problems,
+    lookup_problem,
+    parse_problem_html,
+    problem_from_url,
+)
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "codeforces"
+PROBLEMSET = (FIXTURES_DIR / "problemset.json").read_text(encoding="utf-8")
+
+def _api_response(result: dict) -> str:
+    return json.dumps({"status": "OK", "result": result})
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    """Serve `fetch_text` from a {key: payload or exception} dict, recording the URLs."""
+    payloads = {PROBLEMSET_KEY: PROBLEMSET}
+    urls = []
+
+    def fetch_text(platform, key, method, url, validate=None, **kwargs):
+        urls.append(url)
+        payload = payloads[key]
+        if isinstance(payload, Exception):
+            raise payload
+        return payload
+
+    monkeypatch.setattr(client, "fetch_text", fetch_text)
+    # the index is parsed once per process
+    monkeypatch.setattr(codeforces, "_index", None)
+    return payloads, urls
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("https://codeforces.com/problemset/problem/4/A", (4, "A")),
+        ("https://codeforces.com/contest/1850/problem/D/", (1850, "D")),
+        ("https://codeforces.com/contest/2000/problem/H2", (2000, "H2")),
+    ],
+)
+def test_problem_from_url(url, expected):
+    assert problem_from_url(url) == expected
+
+def test_problem_from_url_rejects_other_pages():
+    with pytest.raises(ValueError):
+        problem_from_url("https://codeforces.com/contest/4")
+
+def test_parse_statement():
+    data = parse_problem_html((FIXTURES_DIR / "small.html").read_text(encoding="utf-8"))
+    assert data["title"] == "Watermelon"
+    assert data["description"].startswith("One hot summer day Pete and his friend Billy")
+    assert "`w` kilos" in data["description"]
+    assert data["constraints"] == "time limit per test: 1 second\nmemory limit per test: 256 megabytes"
+    assert data["input_spec"].startswith("The first (and the only) input line contains integer number `w`")
+    assert data["output_spec"].startswith("Print YES, if the boys can divide")
+    assert (data["constraints_header"], data["input_header"], data["output_header"]) == ("Limits", "Input", "Output")
+    assert data["sample_inputs"] == ["8"]
+    assert data["sample_outputs"] == ["YES"]
+
+@pytest.mark.parametrize(
+    ("page", "title", "samples"),
+    [
+        ("small", "Watermelon", 1),
+        ("typical", "Balanced Round", 1),
+        ("pathological", "Range Xor Queries (Hard Version)", 30),
+    ],
+)
+def test_parse_statement_fixtures(page, title, samples):
+    data = parse_problem_html((FIXTURES_DIR / f"{page}.html").read_text(encoding="utf-8"))
+    assert data["title"] == title
+    assert len(data["sample_inputs"]) == len(data["sample_outputs"]) == samples
+    assert all(data["sample_inputs"]) and all(data["sample_outputs"])
+
+def test_parse_statement_without_statement():
+    with pytest.raises(ValueError):
+        parse_problem_html("<html><body><div class='problem-statement'></div></body></html>")
+
+def test_index_problems():
+    problems = json.loads(PROBLEMSET)["result"]["problems"]
+    index = _index_problems(problems + [{"index": "A", "name": "Gym problem"}])
+    assert len(index) == len(problems)
+    assert index["4A"] == {"name": "Watermelon", "rating": 800, "tags": ["brute force", "math"]}
+
+def test_lookup_problem_from_index(stub_client):
+    _, urls = stub_client
+    assert lookup_problem(1850, "D")["name"] == "Balanced Round"
+    assert lookup_problem(4, "A")["rating"] == 800
+    # one problemset call serves every lookup
+    assert urls == [f"{codeforces.BASE_URL}/api/problemset.problems"]
+
+def test_lookup_problem_falls_back_to_contest_standings(stub_client):
+    payloads, urls = stub_client
+    payloads["contest/9999"] = _api_response({
+        "contest": {"id": 9999},
+        "problems": [{"contestId": 9999, "index": "B", "name": "Fresh Round", "tags": ["math"]}],
+        "rows": [],
+    })
+    assert lookup_problem(9999, "B") == {"name": "Fresh Round", "rating": None, "tags": ["math"]}
+    assert urls[-1] == f"{codeforces.BASE_URL}/api/contest.standings?contestId=9999&from=1&count=1"
+
+def test_lookup_problem_unknown_contest(stub_client):
+    payloads, _ = stub_client
+    # the API answers 400 for contests it doesn't know
+    payloads["contest/9999"] = _http_error(400)
+    with pytest.raises(ValueError, match="9999B not found"):
+        lookup_problem(9999, "B")
+
+def test_lookup_problem_server_error(stub_client):
+    payloads, _ = stub_client
+    payloads["contest/9999"] = _http_error(503)
+    with pytest.raises(requests.HTTPError):
+        lookup_problem(9999, "B")
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+
+from daisy_cli.platforms.dmoj import (
+    STREAM_CHUNK_SIZE,
+    _api_problem,
+    parse_problem_html,
+    parse_problem_source,
+    parse_problem_stream,
+)
+from daisy_cli.utils import clean_title
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+PAGES = sorted((FIXTURES_DIR / "dmoj").glob("*.html"))
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda p: p.stem)
+# small chunks split tags and entities across feeds
+@pytest.mark.parametrize("chunk_size", [STREAM_CHUNK_SIZE, 7])
+def test_stream_parser_matches_tree_parser(page, chunk_size):
+    html = page.read_text(encoding="utf-8")
+    assert parse_problem_stream(html, chunk_size) == parse_problem_html(html)
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda p: p.stem)
+def test_markdown_parser_matches_tree_parser(page):
+    # the API object of the same problem, with the statement's markdown source
+    payload = (FIXTURES_DIR / "dmoj_api" / f"{page.stem}.json").read_text(encoding="utf-8")
+    problem = _api_problem(payload)
+    assert problem is not None
+
+    source = parse_problem_source(problem["description"], clean_title(problem["name"]))
+    assert source == parse_problem_html(page.read_text(encoding="utf-8"))
@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+
+from daisy_cli.formatter import MAX_INLINE_SAMPLE_BYTES, SAMPLE_DATA_DIR, externalize_samples, render_rust_template
+from daisy_cli.platforms.leetcode import parse_question
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+def _sample_bytes(sample: dict) -> int:
+    return len(sample["input"].encode()) + len(sample["output"].encode())
+
+def _stdin_samples(sizes: list[int]) -> list[dict]:
+    return [{"name": f"example_{i + 1}", "input": "1" * size, "output": "2"} for i, size in enumerate(sizes)]
+
+def test_many_small_leetcode_samples_are_externalized():
+    payload = json.loads((FIXTURES_DIR / "leetcode" / "pathological.json").read_text(encoding="utf-8"))
+    data = parse_question(payload["data"]["question"])
+    sizes = {
+        f"example_{i + 1}": len(inn.encode()) + len(out.encode())
+        for i, (inn, out) in enumerate(zip(data["sample_inputs"], data["sample_outputs"]))
+    }
+    # every sample fits the limit on its own, only together they don't
+    assert max(sizes.values()) < MAX_INLINE_SAMPLE_BYTES < sum(sizes.values())
+
+    files = render_rust_template(data, "leetcode")
+    # tests/data/example_<n>_<argument>.json
+    moved = {Path(path).stem.rsplit("_", 1)[0] for path in files if path.startswith(SAMPLE_DATA_DIR)}
+    assert moved
+    assert sum(size for name, size in sizes.items() if name not in moved) <= MAX_INLINE_SAMPLE_BYTES
+    assert files["src/lib.rs"].count("#[test]") == len(sizes)
+
+def test_samples_are_externalized_largest_first():
+    samples = _stdin_samples([1500, 3000, 1000, 2000])
+    files = externalize_samples(samples, {}, "dmoj", max_inline_bytes=4096)
+    # 7504 bytes inline: moving the 3000 and 2000 byte samples is enough
+    assert sorted(files) == [f"{SAMPLE_DATA_DIR}/example_{i}.{ext}" for i in (2, 4) for ext in ("in", "out")]
+    assert [("data" in sample) for sample in samples] == [False, True, False, True]
+    assert sum(_sample_bytes(s) for s in samples if "data" not in s) <= 4096
+
+def test_samples_within_the_limit_stay_inline():
+    samples = _stdin_samples([1000, 1000, 1000])
+    assert externalize_samples(samples, {}, "codeforces", max_inline_bytes=4096) == {}
+    assert not any("data" in sample for sample in samples)
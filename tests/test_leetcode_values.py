@@ -0,0 +1,70 @@
+import pytest
+
+from daisy_cli.platforms.leetcode import _parse_assignments, _parse_literal, _to_rust_value
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        # nested lists
+        ("[]", "vec![]"),
+        ("[[]]", "vec![vec![]]"),
+        ("[[1,2],[3]]", "vec![vec![1, 2], vec![3]]"),
+        ("[[1,[2,[3]]]]", "vec![vec![1, vec![2, vec![3]]]]"),
+        # strings holding quotes, commas and brackets
+        ('"a,b]"', '"a,b]"'),
+        ('["a,b","c]","[d"]', 'vec!["a,b", "c]", "[d"]'),
+        ('["say \\"hi\\""]', 'vec!["say \\"hi\\""]'),
+        ("['x\"y']", 'vec!["x\\"y"]'),
+        # null is kept as written
+        ("null", "null"),
+        ("[null,null]", "vec![null, null]"),
+        ("[1,null,3]", "vec![1, null, 3]"),
+        ('["a",null]', 'vec!["a", null]'),
+        ("[[1],null]", "vec![vec![1], null]"),
+        # negative numbers and floats
+        ("-5", "-5"),
+        ("2.50000", "2.50000"),
+        ("[-1,-2.5,3e4]", "vec![-1, -2.5, 3e4]"),
+        # booleans: a whole literal is lowercased, list items kept as written
+        ("True", "true"),
+        ("[true,false]", "vec![true, false]"),
+        ("[True,False]", "vec![True, False]"),
+        # surrounding space
+        ("  7  ", "7"),
+        # not a literal: kept as written
+        ("[1,2", "[1,2"),
+        ("[1,,2]", "[1,,2]"),
+        ("[1] x", "[1] x"),
+    ],
+)
+def test_to_rust_value(raw, expected):
+    assert _to_rust_value(raw) == expected
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        (
+            "nums = [2,7,11,15], target = 9",
+            [("nums", "vec![2, 7, 11, 15]", "[2,7,11,15]"), ("target", "9", "9")],
+        ),
+        (
+            's = "a, b = c", k = -2',
+            [("s", '"a, b = c"', '"a, b = c"'), ("k", "-2", "-2")],
+        ),
+        (
+            'grid = [["1","0"],["0","1"]], x = null',
+            [("grid", 'vec![vec!["1", "0"], vec!["0", "1"]]', '[["1","0"],["0","1"]]'), ("x", "null", "null")],
+        ),
+        ("a = [1,2, b = 3", []),
+    ],
+)
+def test_parse_assignments(raw, expected):
+    assert _parse_assignments(raw) == expected
+
+def test_parse_literal_stops_after_the_value():
+    assert _parse_literal("[1,2], k = 3") == ("vec![1, 2]", 5)
+
+@pytest.mark.parametrize("raw", ["", "[", "]", "[1,,2]", ",1"])
+def test_parse_literal_rejects_malformed_input(raw):
+    with pytest.raises(ValueError):
+        _parse_literal(raw)